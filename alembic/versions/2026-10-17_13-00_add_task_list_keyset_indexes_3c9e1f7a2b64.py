@@ -0,0 +1,40 @@
+"""add task list keyset indexes
+
+Revision ID: 3c9e1f7a2b64
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-17 13:00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "3c9e1f7a2b64"
+down_revision: str | Sequence[str] | None = "a1b2c3d4e5f6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_team_created",
+            "tasks",
+            ["team_id", sa.text("task_create_date DESC"), "task_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_team_executor_created",
+            "tasks",
+            ["team_id", "executor", sa.text("task_create_date DESC"), "task_id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in ("ix_tasks_team_executor_created", "ix_tasks_team_created"):
+            op.drop_index(name, table_name="tasks", postgresql_concurrently=True)
@@ -0,0 +1,64 @@
+"""add task counters
+
+Revision ID: 8d41c2e07b59
+Revises: 3c9e1f7a2b64
+Create Date: 2026-10-17 14:00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+revision: str = "8d41c2e07b59"
+down_revision: str | Sequence[str] | None = "3c9e1f7a2b64"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_counters",
+        sa.Column("id", sa.Uuid(), nullable=False, comment="гуид"),
+        sa.Column("team_id", sa.Uuid(), nullable=False, comment="гуид команды"),
+        sa.Column("executor", sa.Uuid(), nullable=True, comment="исполнитель"),
+        sa.Column(
+            "status",
+            postgresql.ENUM(name="status", create_type=False),
+            nullable=False,
+            comment="статус задач",
+        ),
+        sa.Column(
+            "task_count",
+            sa.BigInteger(),
+            nullable=False,
+            server_default=sa.text("0"),
+            comment="количество неудалённых задач",
+        ),
+        sa.ForeignKeyConstraint(["team_id"], ["teams_to_rooms.team_id"]),
+        sa.ForeignKeyConstraint(["executor"], ["users.user_id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "team_id",
+            "executor",
+            "status",
+            name="uix_task_counters_team_executor_status",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+    op.execute(
+        """
+        INSERT INTO task_counters (id, team_id, executor, status, task_count)
+        SELECT gen_random_uuid(), team_id, executor, status, count(*)
+        FROM tasks
+        WHERE deleted_at IS NULL
+        GROUP BY team_id, executor, status
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("task_counters")
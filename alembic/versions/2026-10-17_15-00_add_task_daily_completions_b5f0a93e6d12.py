@@ -0,0 +1,65 @@
+"""add task daily completions
+
+Revision ID: b5f0a93e6d12
+Revises: 8d41c2e07b59
+Create Date: 2026-10-17 15:00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "b5f0a93e6d12"
+down_revision: str | Sequence[str] | None = "8d41c2e07b59"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_daily_completions",
+        sa.Column("id", sa.Uuid(), nullable=False, comment="гуид"),
+        sa.Column("team_id", sa.Uuid(), nullable=False, comment="гуид команды"),
+        sa.Column("executor", sa.Uuid(), nullable=True, comment="исполнитель"),
+        sa.Column("day", sa.Date(), nullable=False, comment="день завершения по UTC"),
+        sa.Column(
+            "completed_count",
+            sa.BigInteger(),
+            nullable=False,
+            server_default=sa.text("0"),
+            comment="количество завершённых задач",
+        ),
+        sa.ForeignKeyConstraint(["team_id"], ["teams_to_rooms.team_id"]),
+        sa.ForeignKeyConstraint(["executor"], ["users.user_id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "team_id",
+            "executor",
+            "day",
+            name="uix_task_daily_completions_team_executor_day",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+    op.execute(
+        """
+        INSERT INTO task_daily_completions
+            (id, team_id, executor, day, completed_count)
+        SELECT
+            gen_random_uuid(),
+            team_id,
+            executor,
+            (task_finish_date AT TIME ZONE 'UTC')::date,
+            count(*)
+        FROM tasks
+        WHERE deleted_at IS NULL
+          AND status = 'completed'::status
+        GROUP BY team_id, executor, (task_finish_date AT TIME ZONE 'UTC')::date
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("task_daily_completions")
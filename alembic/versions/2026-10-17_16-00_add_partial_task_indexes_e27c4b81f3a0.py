@@ -0,0 +1,98 @@
+"""add partial task indexes
+
+Revision ID: e27c4b81f3a0
+Revises: b5f0a93e6d12
+Create Date: 2026-10-17 16:00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "e27c4b81f3a0"
+down_revision: str | Sequence[str] | None = "b5f0a93e6d12"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+LIVE_PREDICATE = "deleted_at IS NULL"
+OPEN_PREDICATE = "status IN ('unassigned', 'assigned', 'in_progress')"
+COMPLETED_PREDICATE = "status = 'completed'"
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_team_created_live",
+            "tasks",
+            ["team_id", sa.text("task_create_date DESC"), "task_id"],
+            postgresql_where=sa.text(LIVE_PREDICATE),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_team_executor_created_live",
+            "tasks",
+            ["team_id", "executor", sa.text("task_create_date DESC"), "task_id"],
+            postgresql_where=sa.text(LIVE_PREDICATE),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_team_open",
+            "tasks",
+            ["team_id", "executor"],
+            postgresql_include=["priority", "difficulty", "task_deadline_date"],
+            postgresql_where=sa.text(f"{LIVE_PREDICATE} AND {OPEN_PREDICATE}"),
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_team_completed_finish",
+            "tasks",
+            ["team_id", "task_finish_date"],
+            postgresql_include=["executor"],
+            postgresql_where=sa.text(f"{LIVE_PREDICATE} AND {COMPLETED_PREDICATE}"),
+            postgresql_concurrently=True,
+        )
+        for name in (
+            "ix_tasks_team_created",
+            "ix_tasks_team_executor_created",
+            "ix_tasks_team_status",
+            "ix_tasks_team_finish_date",
+        ):
+            op.drop_index(name, table_name="tasks", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_tasks_team_finish_date",
+            "tasks",
+            ["team_id", "task_finish_date"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_team_status",
+            "tasks",
+            ["team_id", "status"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_team_executor_created",
+            "tasks",
+            ["team_id", "executor", sa.text("task_create_date DESC"), "task_id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_tasks_team_created",
+            "tasks",
+            ["team_id", sa.text("task_create_date DESC"), "task_id"],
+            postgresql_concurrently=True,
+        )
+        for name in (
+            "ix_tasks_team_completed_finish",
+            "ix_tasks_team_open",
+            "ix_tasks_team_executor_created_live",
+            "ix_tasks_team_created_live",
+        ):
+            op.drop_index(name, table_name="tasks", postgresql_concurrently=True)
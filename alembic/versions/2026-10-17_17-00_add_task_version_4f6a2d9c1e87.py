@@ -0,0 +1,35 @@
+"""add task version
+
+Revision ID: 4f6a2d9c1e87
+Revises: e27c4b81f3a0
+Create Date: 2026-10-17 17:00:00
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "4f6a2d9c1e87"
+down_revision: str | Sequence[str] | None = "e27c4b81f3a0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tasks",
+        sa.Column(
+            "version",
+            sa.Integer(),
+            server_default=sa.text("1"),
+            nullable=False,
+            comment="версия задачи для оптимистичной блокировки",
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("tasks", "version")
@@ -1,3 +1,4 @@
+import hashlib
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Request, status
@@ -13,12 +14,13 @@ from main.schemas.auth import (
     MessageOut,
     RegistrationIn,
     RegistrationOut,
+    SessionListOut,
     Token,
     TokenData,
     UserProfileOut,
 )
 from main.services.auth import AuthRegUserServices, oauth2_scheme
-from main.services.rate_limit import enforce_rate_limit
+from main.services.rate_limit import RateLimit, enforce_rate_limit, enforce_rate_limits
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -43,6 +45,10 @@ def _client_identity(request: Request) -> str:
     return request.client.host if request.client else "unknown"
 
 
+def _account_identity(email: str) -> str:
+    return hashlib.sha256(email.strip().lower().encode()).hexdigest()[:32]
+
+
 @router.post(
     "/register",
     summary="Регистрация пользователя",
@@ -70,7 +76,10 @@ async def refresh_token(
     service: AuthRegUserServices = Depends(get_auth_service),
 ) -> Token:
     await enforce_rate_limit(_client_identity(request), "refresh", 20, 60)
-    return await service.update_token(data.refresh_token)
+    return await service.update_token(
+        data.refresh_token,
+        request.headers.get("user-agent"),
+    )
 
 
 @router.post("/login", summary="Авторизация пользователя", response_model=Token)
@@ -79,9 +88,13 @@ async def login_user(
     request: Request,
     service: AuthRegUserServices = Depends(get_auth_service),
 ) -> Token:
-    await enforce_rate_limit(_client_identity(request), "login", 10, 60)
+    await enforce_rate_limits(
+        RateLimit("login", _client_identity(request), 10, 60),
+        RateLimit("login-account", _account_identity(data.username), 10, 600),
+    )
     return await service.login_service(
-        LogIn(email=data.username, password=data.password)
+        LogIn(email=data.username, password=data.password),
+        request.headers.get("user-agent"),
     )
 
 
@@ -94,6 +107,30 @@ async def logout_user(
     return await service.logout_service(data.refresh_token, current_user.user_id)
 
 
+@router.post(
+    "/logout-all",
+    summary="Выход на всех устройствах",
+    response_model=MessageOut,
+)
+async def logout_all_devices(
+    current_user: TokenData = Depends(get_current_user),
+    service: AuthRegUserServices = Depends(get_auth_service),
+) -> dict[str, str]:
+    return await service.logout_all_service(current_user.user_id)
+
+
+@router.get(
+    "/sessions",
+    summary="Активные сессии пользователя",
+    response_model=SessionListOut,
+)
+async def list_sessions(
+    current_user: TokenData = Depends(get_current_user),
+    service: AuthRegUserServices = Depends(get_auth_service),
+) -> SessionListOut:
+    return await service.list_sessions_service(current_user.user_id)
+
+
 @router.get("/me", summary="Текущий пользователь", response_model=UserProfileOut)
 async def get_user_profile(
     current_user: TokenData = Depends(get_current_user),
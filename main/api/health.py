@@ -4,8 +4,15 @@ from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from main.db.connect import get_async_session
-from main.redis import redis_client
+from main.db.connect import (
+    engine,
+    get_primary_session,
+    pool_snapshot,
+    replica_engine,
+    replica_router,
+)
+from main.redis import redis_breaker, redis_client
+from main.services.hashing import password_hash_pool
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -17,7 +24,7 @@ async def liveness() -> dict[str, str]:
 
 @router.get("/ready", include_in_schema=False)
 async def readiness(
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_primary_session),
 ) -> dict[str, str]:
     try:
         await session.execute(text("SELECT 1"))
@@ -28,3 +35,18 @@ async def readiness(
             detail="Сервис не готов принимать запросы",
         ) from exc
     return {"status": "ready"}
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> dict[str, dict | None]:
+    replica = (
+        {**pool_snapshot(replica_engine), "healthy": replica_router.replica_healthy}
+        if replica_engine is not None
+        else None
+    )
+    return {
+        "db_pool": pool_snapshot(engine),
+        "db_replica_pool": replica,
+        "password_hashing": password_hash_pool.snapshot(),
+        "redis": redis_breaker.snapshot(),
+    }
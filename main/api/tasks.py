@@ -1,7 +1,8 @@
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi import APIRouter, Depends, Header, Query, Response, status
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from main.api.auth import get_current_user
@@ -10,9 +11,16 @@ from main.db.models.tasks import Status
 from main.repositories.tasks import TaskRepository
 from main.schemas.auth import TokenData
 from main.schemas.tasks import (
+    TaskBatchCreate,
+    TaskBatchOut,
+    TaskBulkAction,
+    TaskBulkOut,
     TaskCreate,
+    TaskDetailsOut,
     TaskListOut,
     TaskOut,
+    TaskSeriesBucket,
+    TaskSeriesOut,
     TaskTeamStatsOut,
     TaskUpdate,
     TaskUserStatsOut,
@@ -30,33 +38,146 @@ def get_task_service(
 
 PageLimit = Annotated[int, Query(ge=1, le=100)]
 PageOffset = Annotated[int, Query(ge=0)]
+PageCursor = Annotated[str | None, Query(max_length=200)]
+TotalCap = Annotated[int | None, Query(ge=1, le=100_000)]
 PeriodDays = Annotated[int, Query(ge=1, le=3650)]
+IfMatch = Annotated[str | None, Header(max_length=1000)]
+IfNoneMatch = Annotated[str | None, Header(max_length=1000)]
+Prefer = Annotated[str | None, Header(max_length=1000)]
+MINIMAL_PREFERENCE = "return=minimal"
+REPRESENTATION_PREFERENCE = "return=representation"
+
+
+def task_etag(version: int) -> str:
+    return f'"{version}"'
+
+
+def parse_if_match(if_match: str | None) -> frozenset[int] | None:
+    if if_match is None or if_match.strip() == "*":
+        return None
+    versions = set()
+    for tag in if_match.split(","):
+        tag = tag.strip()
+        if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit():
+            versions.add(int(tag[1:-1]))
+    return frozenset(versions)
+
+
+def etag_matches(if_none_match: str | None, version: int) -> bool:
+    if if_none_match is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    etag = task_etag(version)
+    return any(
+        tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(",")
+    )
+
+
+def prefers(prefer: str | None, preference: str) -> bool:
+    if prefer is None:
+        return False
+    return any(
+        requested.split(";")[0].strip().lower() == preference
+        for requested in prefer.split(",")
+    )
+
+
+def set_task_headers(
+    response: Response,
+    version: int,
+    applied: str | None = None,
+) -> None:
+    response.headers["ETag"] = task_etag(version)
+    if applied:
+        response.headers["Preference-Applied"] = applied
 
 
 @router.post(
     "/teams/{team_id}/tasks",
-    response_model=TaskOut,
+    response_model=TaskDetailsOut | TaskOut,
     status_code=status.HTTP_201_CREATED,
 )
 async def create_task(
     team_id: UUID,
     data: TaskCreate,
+    response: Response,
+    prefer: Prefer = None,
+    current_user: TokenData = Depends(get_current_user),
+    service: TaskServices = Depends(get_task_service),
+) -> TaskDetailsOut | TaskOut:
+    task = await service.create_task(data, team_id, current_user.user_id)
+    minimal = prefers(prefer, MINIMAL_PREFERENCE)
+    set_task_headers(response, task.version, MINIMAL_PREFERENCE if minimal else None)
+    return TaskOut(task_id=task.task_id) if minimal else task
+
+
+@router.post(
+    "/teams/{team_id}/tasks:batch",
+    response_model=TaskBatchOut,
+    status_code=status.HTTP_201_CREATED,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Ни одна задача не создана"}
+    },
+)
+async def create_tasks(
+    team_id: UUID,
+    data: TaskBatchCreate,
+    current_user: TokenData = Depends(get_current_user),
+    service: TaskServices = Depends(get_task_service),
+) -> TaskBatchOut:
+    return await service.create_tasks(data, team_id, current_user.user_id)
+
+
+@router.post("/teams/{team_id}/tasks:bulk", response_model=TaskBulkOut)
+async def apply_bulk_task_action(
+    team_id: UUID,
+    data: TaskBulkAction,
     current_user: TokenData = Depends(get_current_user),
     service: TaskServices = Depends(get_task_service),
-) -> TaskOut:
-    task_id = await service.create_task(data, team_id, current_user.user_id)
-    return TaskOut(task_id=task_id)
+) -> TaskBulkOut:
+    return await service.apply_bulk_action(data, team_id, current_user.user_id)
 
 
-@router.patch("/tasks/{task_id}", response_model=TaskOut)
+@router.get(
+    "/tasks/{task_id}",
+    response_model=TaskDetailsOut,
+    responses={status.HTTP_304_NOT_MODIFIED: {"description": "ETag не изменился"}},
+)
+async def get_task(
+    task_id: UUID,
+    response: Response,
+    if_none_match: IfNoneMatch = None,
+    current_user: TokenData = Depends(get_current_user),
+    service: TaskServices = Depends(get_task_service),
+) -> TaskDetailsOut | Response:
+    task = await service.get_task(task_id, current_user.user_id)
+    headers = {"ETag": task_etag(task.version), "Cache-Control": "private, no-cache"}
+    if etag_matches(if_none_match, task.version):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return TaskDetailsOut.model_validate(task)
+
+
+@router.patch("/tasks/{task_id}", response_model=TaskDetailsOut | TaskOut)
 async def update_task(
     task_id: UUID,
     data: TaskUpdate,
+    response: Response,
+    if_match: IfMatch = None,
+    prefer: Prefer = None,
     current_user: TokenData = Depends(get_current_user),
     service: TaskServices = Depends(get_task_service),
-) -> TaskOut:
-    updated_id = await service.update_task(data, task_id, current_user.user_id)
-    return TaskOut(task_id=updated_id)
+) -> TaskDetailsOut | TaskOut:
+    task = await service.update_task(
+        data,
+        task_id,
+        current_user.user_id,
+        parse_if_match(if_match),
+    )
+    minimal = prefers(prefer, MINIMAL_PREFERENCE)
+    set_task_headers(response, task.version, MINIMAL_PREFERENCE if minimal else None)
+    return TaskOut(task_id=task.task_id) if minimal else task
 
 
 @router.delete("/tasks/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -69,14 +190,36 @@ async def delete_task(
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@router.post("/tasks/{task_id}/complete", status_code=status.HTTP_204_NO_CONTENT)
+@router.post(
+    "/tasks/{task_id}/complete",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_model=None,
+    responses={
+        status.HTTP_200_OK: {
+            "model": TaskDetailsOut,
+            "description": "Prefer: return=representation",
+        },
+    },
+)
 async def complete_task(
     task_id: UUID,
+    if_match: IfMatch = None,
+    prefer: Prefer = None,
     current_user: TokenData = Depends(get_current_user),
     service: TaskServices = Depends(get_task_service),
 ) -> Response:
-    await service.complete_task(task_id, current_user.user_id)
-    return Response(status_code=status.HTTP_204_NO_CONTENT)
+    task = await service.complete_task(
+        task_id,
+        current_user.user_id,
+        parse_if_match(if_match),
+    )
+    if not prefers(prefer, REPRESENTATION_PREFERENCE):
+        completed = Response(status_code=status.HTTP_204_NO_CONTENT)
+        set_task_headers(completed, task.version)
+        return completed
+    represented = JSONResponse(task.model_dump(mode="json"))
+    set_task_headers(represented, task.version, REPRESENTATION_PREFERENCE)
+    return represented
 
 
 @router.get("/teams/{team_id}/tasks", response_model=TaskListOut)
@@ -86,6 +229,9 @@ async def get_team_tasks(
     days: PeriodDays = 7,
     limit: PageLimit = 50,
     offset: PageOffset = 0,
+    cursor: PageCursor = None,
+    include_total: bool = True,
+    total_cap: TotalCap = None,
     current_user: TokenData = Depends(get_current_user),
     service: TaskServices = Depends(get_task_service),
 ) -> TaskListOut:
@@ -96,6 +242,9 @@ async def get_team_tasks(
         days,
         limit,
         offset,
+        cursor,
+        include_total,
+        total_cap,
     )
 
 
@@ -110,6 +259,9 @@ async def get_user_tasks(
     days: PeriodDays = 7,
     limit: PageLimit = 50,
     offset: PageOffset = 0,
+    cursor: PageCursor = None,
+    include_total: bool = True,
+    total_cap: TotalCap = None,
     current_user: TokenData = Depends(get_current_user),
     service: TaskServices = Depends(get_task_service),
 ) -> TaskListOut:
@@ -121,6 +273,9 @@ async def get_user_tasks(
         days,
         limit,
         offset,
+        cursor,
+        include_total,
+        total_cap,
     )
 
 
@@ -155,3 +310,21 @@ async def get_team_task_stats(
         current_user.user_id,
         days,
     )
+
+
+@router.get("/teams/{team_id}/stats/timeseries", response_model=TaskSeriesOut)
+async def get_team_task_timeseries(
+    team_id: UUID,
+    bucket: TaskSeriesBucket = TaskSeriesBucket.day,
+    days: PeriodDays = 90,
+    user_id: UUID | None = None,
+    current_user: TokenData = Depends(get_current_user),
+    service: TaskServices = Depends(get_task_service),
+) -> TaskSeriesOut:
+    return await service.get_completion_series(
+        team_id,
+        current_user.user_id,
+        user_id,
+        bucket,
+        days,
+    )
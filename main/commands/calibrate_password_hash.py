@@ -0,0 +1,84 @@
+import argparse
+import os
+import statistics
+import time
+
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+SAMPLE_PASSWORD = "calibration-password-1234"
+MIN_MEMORY_COST = 8_192
+
+
+def measure_ms(
+    time_cost: int,
+    memory_cost: int,
+    parallelism: int,
+    rounds: int,
+) -> float:
+    hasher = Argon2Hasher(
+        time_cost=time_cost,
+        memory_cost=memory_cost,
+        parallelism=parallelism,
+    )
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        hasher.hash(SAMPLE_PASSWORD)
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def calibrate(
+    target_ms: float,
+    max_memory_cost: int,
+    parallelism: int,
+    rounds: int,
+) -> tuple[int, int, float]:
+    memory_cost = max_memory_cost
+    while memory_cost >= MIN_MEMORY_COST:
+        single_pass_ms = measure_ms(1, memory_cost, parallelism, rounds)
+        if single_pass_ms <= target_ms:
+            break
+        memory_cost //= 2
+    else:
+        memory_cost = MIN_MEMORY_COST
+        return 1, memory_cost, measure_ms(1, memory_cost, parallelism, rounds)
+
+    time_cost = max(int(target_ms // single_pass_ms), 1)
+    elapsed_ms = measure_ms(time_cost, memory_cost, parallelism, rounds)
+    while time_cost > 1 and elapsed_ms > target_ms:
+        time_cost -= 1
+        elapsed_ms = measure_ms(time_cost, memory_cost, parallelism, rounds)
+    return time_cost, memory_cost, elapsed_ms
+
+
+def available_cpus() -> int:
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Подбор параметров Argon2 под целевое время хеширования",
+    )
+    parser.add_argument("--target-ms", type=float, default=50.0)
+    parser.add_argument("--max-memory-kib", type=int, default=65_536)
+    parser.add_argument("--parallelism", type=int, default=min(available_cpus(), 4))
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    time_cost, memory_cost, elapsed_ms = calibrate(
+        target_ms=args.target_ms,
+        max_memory_cost=max(args.max_memory_kib, MIN_MEMORY_COST),
+        parallelism=args.parallelism,
+        rounds=args.rounds,
+    )
+    print(f"# median hash time: {elapsed_ms:.1f} ms (target {args.target_ms:g} ms)")
+    print(f"PASSWORD_HASH_TIME_COST={time_cost}")
+    print(f"PASSWORD_HASH_MEMORY_COST={memory_cost}")
+    print(f"PASSWORD_HASH_PARALLELISM={args.parallelism}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+import argparse
+import asyncio
+import json
+import sys
+import uuid
+from collections.abc import Awaitable, Callable, Iterator
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from main.db.connect import engine
+from main.db.models.tasks import Status
+from main.repositories.tasks import TaskRepository
+from main.schemas.tasks import TaskSeriesBucket
+
+CHECKED_RELATIONS = frozenset({"tasks", "task_counters", "task_daily_completions"})
+
+SEED_STATEMENTS = (
+    "INSERT INTO rooms (room_id, name) VALUES (:room_id, 'explain')",
+    """
+    INSERT INTO users (user_id, email, first_name, last_name, password)
+    SELECT gen_random_uuid(), 'explain-' || g || '-' || :room_id || '@example.invalid',
+           'explain', 'explain', 'explain'
+    FROM generate_series(1, :users) AS g
+    """,
+    """
+    INSERT INTO teams_to_rooms (team_id, room_id, name)
+    SELECT gen_random_uuid(), :room_id, 'explain-' || g
+    FROM generate_series(1, :teams) AS g
+    """,
+    """
+    INSERT INTO teams (id, team_id, user_id, is_chief)
+    SELECT gen_random_uuid(), team.team_id, member.user_id, member.rn = 1
+    FROM (
+        SELECT team_id, row_number() OVER (ORDER BY team_id) - 1 AS team_index
+        FROM teams_to_rooms WHERE room_id = :room_id
+    ) AS team
+    JOIN (
+        SELECT user_id, row_number() OVER (ORDER BY user_id) AS rn
+        FROM users WHERE email LIKE 'explain-%-' || :room_id || '@example.invalid'
+    ) AS member ON (member.rn - 1) % :teams = team.team_index
+    """,
+    """
+    WITH team AS (
+        SELECT array_agg(team_id ORDER BY team_id) AS ids
+        FROM teams_to_rooms WHERE room_id = :room_id
+    ),
+    member AS (
+        SELECT team_id, array_agg(user_id ORDER BY user_id) AS ids
+        FROM teams WHERE team_id IN (
+            SELECT team_id FROM teams_to_rooms WHERE room_id = :room_id
+        )
+        GROUP BY team_id
+    ),
+    seed AS (
+        SELECT g,
+               team.ids[1 + g % cardinality(team.ids)] AS team_id,
+               CASE
+                   WHEN g % 100 < 70 THEN 'completed'
+                   WHEN g % 100 < 75 THEN 'canceled'
+                   WHEN g % 100 < 85 THEN 'in_progress'
+                   WHEN g % 100 < 95 THEN 'assigned'
+                   ELSE 'unassigned'
+               END AS status
+        FROM generate_series(1, :tasks) AS g, team
+    )
+    INSERT INTO tasks (
+        task_id, team_id, task_name, task_text, author, executor, priority,
+        status, difficulty, task_create_date, task_deadline_date,
+        task_finish_date, deleted_at
+    )
+    SELECT gen_random_uuid(), seed.team_id, 'explain', 'explain', member.ids[1],
+           CASE WHEN seed.status = 'unassigned' THEN NULL
+                ELSE member.ids[1 + (seed.g / 7) % cardinality(member.ids)] END,
+           (ARRAY['high', 'medium', 'low'])[1 + seed.g % 3]::priority,
+           seed.status::status,
+           (ARRAY['critical_high', 'high', 'medium', 'low', 'unknown'])
+               [1 + seed.g % 5]::difficulty,
+           now() - (seed.g % 730) * interval '1 day' - seed.g * interval '1 ms',
+           now() + (seed.g % 60 - 30) * interval '1 day',
+           CASE WHEN seed.status IN ('completed', 'canceled')
+                THEN now() - (seed.g % 365) * interval '1 day' END,
+           CASE WHEN seed.g % 20 = 0 THEN now() END
+    FROM seed JOIN member ON member.team_id = seed.team_id
+    """,
+    """
+    INSERT INTO task_counters (id, team_id, executor, status, task_count)
+    SELECT gen_random_uuid(), team_id, executor, status, count(*)
+    FROM tasks
+    WHERE deleted_at IS NULL AND team_id IN (
+        SELECT team_id FROM teams_to_rooms WHERE room_id = :room_id
+    )
+    GROUP BY team_id, executor, status
+    ON CONFLICT ON CONSTRAINT uix_task_counters_team_executor_status DO NOTHING
+    """,
+    """
+    INSERT INTO task_daily_completions (id, team_id, executor, day, completed_count)
+    SELECT gen_random_uuid(), team_id, executor,
+           (task_finish_date AT TIME ZONE 'UTC')::date, count(*)
+    FROM tasks
+    WHERE deleted_at IS NULL AND status = 'completed' AND team_id IN (
+        SELECT team_id FROM teams_to_rooms WHERE room_id = :room_id
+    )
+    GROUP BY team_id, executor, (task_finish_date AT TIME ZONE 'UTC')::date
+    ON CONFLICT ON CONSTRAINT uix_task_daily_completions_team_executor_day
+    DO NOTHING
+    """,
+    "ANALYZE tasks, task_counters, task_daily_completions, teams, teams_to_rooms",
+)
+
+
+def plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+def describe(node: dict[str, Any]) -> str:
+    target = node.get("Index Name") or node.get("Relation Name")
+    return f"{node['Node Type']}({target})" if target else node["Node Type"]
+
+
+async def seed(conn: AsyncConnection, teams: int, tasks: int) -> dict[str, Any]:
+    params = {
+        "room_id": str(uuid.uuid4()),
+        "teams": teams,
+        "users": teams * 10,
+        "tasks": tasks,
+    }
+    for statement in SEED_STATEMENTS:
+        await conn.execute(text(statement), params)
+    probe = (
+        await conn.execute(
+            text(
+                """
+                SELECT task.team_id, task.executor, task.task_id,
+                       task.task_create_date
+                FROM tasks AS task
+                JOIN teams_to_rooms AS team ON team.team_id = task.team_id
+                WHERE team.room_id = :room_id
+                  AND task.executor IS NOT NULL
+                  AND task.deleted_at IS NULL
+                ORDER BY task.task_create_date DESC
+                LIMIT 1 OFFSET 500
+                """
+            ),
+            params,
+        )
+    ).one()
+    return probe._asdict()
+
+
+async def explain(teams: int, tasks: int) -> int:
+    captured: list[tuple[str, str, Any]] = []
+    statements: list[tuple[str, Any]] = []
+
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        await conn.execute(text("SET LOCAL statement_timeout = 0"))
+        probe = await seed(conn, teams, tasks)
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters))
+
+        event.listen(conn.sync_connection, "before_cursor_execute", capture)
+        repository = TaskRepository(db=AsyncSession(bind=conn))
+        team_id, user_id = probe["team_id"], probe["executor"]
+        now = datetime.now(UTC)
+        start_date = now - timedelta(days=30)
+        calls: list[tuple[str, Callable[[], Awaitable[Any]]]] = [
+            (
+                "team_access",
+                lambda: repository.get_team_access(team_id, {user_id}),
+            ),
+            (
+                "task_access",
+                lambda: repository.get_task_access(probe["task_id"], {user_id}),
+            ),
+            (
+                "team_list",
+                lambda: repository.get_team_tasks(
+                    team_id, None, start_date, now, 51, 0, None, True, None
+                ),
+            ),
+            (
+                "team_list_cursor",
+                lambda: repository.get_team_tasks(
+                    team_id,
+                    None,
+                    start_date,
+                    now,
+                    51,
+                    0,
+                    (probe["task_create_date"], probe["task_id"]),
+                    True,
+                    1000,
+                ),
+            ),
+            (
+                "team_list_completed",
+                lambda: repository.get_team_tasks(
+                    team_id,
+                    Status.completed,
+                    start_date,
+                    now,
+                    51,
+                    0,
+                    None,
+                    False,
+                    None,
+                ),
+            ),
+            (
+                "user_list",
+                lambda: repository.get_user_tasks(
+                    team_id, user_id, None, start_date, now, 51, 0, None, True, None
+                ),
+            ),
+            (
+                "team_stats",
+                lambda: repository.get_task_statistics(
+                    team_id, None, start_date, now, now
+                ),
+            ),
+            (
+                "user_stats",
+                lambda: repository.get_task_statistics(
+                    team_id, user_id, start_date, now, now
+                ),
+            ),
+            (
+                "team_timeseries",
+                lambda: repository.get_completion_series(
+                    team_id,
+                    None,
+                    TaskSeriesBucket.week,
+                    (now - timedelta(days=365)).date(),
+                    now.date(),
+                ),
+            ),
+        ]
+        for label, call in calls:
+            await call()
+            captured.extend((label, *executed) for executed in statements)
+            statements.clear()
+        event.remove(conn.sync_connection, "before_cursor_execute", capture)
+
+        failures = 0
+        for name, statement, parameters in captured:
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {statement}",
+                parameters,
+            )
+            document = result.scalar_one()
+            if isinstance(document, str):
+                document = json.loads(document)
+            nodes = list(plan_nodes(document[0]["Plan"]))
+            seq_scans = [
+                node
+                for node in nodes
+                if node["Node Type"] == "Seq Scan"
+                and node.get("Relation Name") in CHECKED_RELATIONS
+            ]
+            failures += bool(seq_scans)
+            scans = [describe(node) for node in nodes if "Scan" in node["Node Type"]]
+            status = "FAIL" if seq_scans else "ok"
+            print(f"{status:4} {name:20} {', '.join(scans)}")
+        await transaction.rollback()
+
+    await engine.dispose()
+    print(f"# {len(captured)} statements, {failures} with sequential scans")
+    return failures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Проверка планов запросов к задачам на сгенерированных данных "
+            "(данные откатываются)"
+        ),
+    )
+    parser.add_argument("--teams", type=int, default=50)
+    parser.add_argument("--tasks", type=int, default=200_000)
+    args = parser.parse_args()
+    if asyncio.run(explain(args.teams, args.tasks)):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
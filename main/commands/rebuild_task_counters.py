@@ -0,0 +1,140 @@
+import argparse
+import asyncio
+import sys
+import uuid
+
+from sqlalchemy import (
+    Date,
+    Select,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    text,
+)
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from main.db.base import Base
+from main.db.connect import engine
+from main.db.models.task_counters import TaskCounter
+from main.db.models.task_daily_completions import TaskDailyCompletion
+from main.db.models.tasks import Status, Task
+
+COMPLETION_DAY = cast(
+    func.timezone(literal("UTC", literal_execute=True), Task.task_finish_date),
+    Date,
+)
+
+
+async def reconcile(
+    conn: AsyncConnection,
+    model: type[Base],
+    key_fields: tuple[str, ...],
+    count_field: str,
+    actual_query: Select,
+    dry_run: bool,
+) -> int:
+    actual = {tuple(row[:-1]): row[-1] for row in await conn.execute(actual_query)}
+    stored_rows = await conn.execute(
+        select(*(getattr(model, name) for name in (*key_fields, count_field)))
+    )
+    stored = {tuple(row[:-1]): row[-1] for row in stored_rows}
+
+    drift = sorted(
+        (
+            key
+            for key in actual.keys() | stored.keys()
+            if actual.get(key, 0) != stored.get(key, 0)
+        ),
+        key=lambda key: tuple(str(part) for part in key),
+    )
+    for key in drift:
+        fields = " ".join(
+            f"{name}={getattr(part, 'value', part)}"
+            for name, part in zip(key_fields, key, strict=True)
+        )
+        print(
+            f"drift table={model.__tablename__} {fields} "
+            f"stored={stored.get(key, 0)} actual={actual.get(key, 0)}"
+        )
+
+    if drift and not dry_run:
+        await conn.execute(delete(model))
+        if actual:
+            await conn.execute(
+                insert(model),
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        **dict(zip(key_fields, key, strict=True)),
+                        count_field: count,
+                    }
+                    for key, count in actual.items()
+                ],
+            )
+
+    action = "checked" if dry_run or not drift else "rebuilt"
+    print(
+        f"# {model.__tablename__}: {action} {len(actual)} rows, drift in {len(drift)}"
+    )
+    return len(drift)
+
+
+async def rebuild(dry_run: bool) -> int:
+    target = engine.execution_options(
+        isolation_level="REPEATABLE READ" if dry_run else "READ COMMITTED"
+    )
+    async with target.begin() as conn:
+        await conn.execute(text("SET LOCAL statement_timeout = 0"))
+        if not dry_run:
+            await conn.execute(text("LOCK TABLE tasks IN SHARE MODE"))
+
+        drift = await reconcile(
+            conn,
+            TaskCounter,
+            ("team_id", "executor", "status"),
+            "task_count",
+            select(Task.team_id, Task.executor, Task.status, func.count())
+            .where(Task.deleted_at.is_(None))
+            .group_by(Task.team_id, Task.executor, Task.status),
+            dry_run,
+        )
+        drift += await reconcile(
+            conn,
+            TaskDailyCompletion,
+            ("team_id", "executor", "day"),
+            "completed_count",
+            select(Task.team_id, Task.executor, COMPLETION_DAY, func.count())
+            .where(
+                Task.deleted_at.is_(None),
+                Task.status == Status.completed,
+                Task.task_finish_date.is_not(None),
+            )
+            .group_by(Task.team_id, Task.executor, COMPLETION_DAY),
+            dry_run,
+        )
+    await engine.dispose()
+    return drift
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Пересчёт счётчиков задач по статусам и дневных итогов завершённых задач"
+        ),
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="только показать расхождения, не изменяя счётчики",
+    )
+    args = parser.parse_args()
+    drift = asyncio.run(rebuild(args.dry_run))
+    if args.dry_run and drift:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
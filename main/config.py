@@ -11,9 +11,29 @@ class Settings(BaseSettings):
     DB_HOST: str
     DB_PORT: int
     DB_NAME: str
+    DB_REPLICA_HOST: str | None = None
+    DB_REPLICA_PORT: int | None = None
+    DB_REPLICA_MAX_LAG_SECONDS: float = Field(default=5.0, ge=0)
+    DB_REPLICA_STICKY_SECONDS: int = Field(default=5, ge=0, le=300)
+    DB_REPLICA_LAG_CHECK_SECONDS: float = Field(default=5.0, gt=0, le=300)
+    DB_POOL_SIZE: int = Field(default=10, ge=1, le=200)
+    DB_MAX_OVERFLOW: int = Field(default=10, ge=0, le=200)
+    DB_POOL_TIMEOUT_SECONDS: float = Field(default=10.0, gt=0, le=120)
+    DB_POOL_RECYCLE_SECONDS: int = Field(default=1800, ge=-1)
+    DB_STATEMENT_TIMEOUT_MS: int = Field(default=15_000, ge=0)
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = Field(default=100, ge=0)
+    DB_QUERY_CACHE_SIZE: int = Field(default=500, ge=0)
+    DB_PGBOUNCER: bool = False
+    DB_SLOW_QUERY_MS: int = Field(default=200, ge=0)
+    DB_REPEATED_STATEMENT_THRESHOLD: int = Field(default=10, ge=2)
 
     SECRET_KEY: SecretStr = Field(min_length=32)
     REDIS_URL: str
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = Field(default=3.0, gt=0, le=30)
+    REDIS_SLOW_CALL_SECONDS: float = Field(default=0.5, gt=0, le=30)
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = Field(default=5, ge=1, le=1000)
+    REDIS_BREAKER_RESET_SECONDS: float = Field(default=5.0, gt=0, le=300)
+    RATE_LIMIT_FALLBACK_KEYS: int = Field(default=10_000, ge=1)
 
     ENVIRONMENT: str = "development"
     SQL_ECHO: bool = False
@@ -23,6 +43,15 @@ class Settings(BaseSettings):
     MAX_REQUEST_BODY_BYTES: int = 1_048_576
     ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=30, ge=5, le=1440)
     REFRESH_TOKEN_EXPIRE_DAYS: int = Field(default=1, ge=1, le=30)
+    AUTH_TOKEN_CACHE_SIZE: int = Field(default=10_000, ge=0)
+    AUTH_USER_CACHE_SIZE: int = Field(default=10_000, ge=0)
+    AUTH_USER_CACHE_TTL_SECONDS: int = Field(default=5, ge=0, le=60)
+    AUTH_REDIS_GRACE_SECONDS: int = Field(default=30, ge=0, le=300)
+    PASSWORD_HASH_WORKERS: int = Field(default=2, ge=1, le=64)
+    PASSWORD_HASH_QUEUE_SIZE: int = Field(default=16, ge=0, le=10_000)
+    PASSWORD_HASH_TIME_COST: int = Field(default=3, ge=1, le=100)
+    PASSWORD_HASH_MEMORY_COST: int = Field(default=65_536, ge=8_192, le=4_194_304)
+    PASSWORD_HASH_PARALLELISM: int = Field(default=4, ge=1, le=64)
 
     model_config = SettingsConfigDict(
         env_file=Path(__file__).with_name(".env"),
@@ -31,23 +60,30 @@ class Settings(BaseSettings):
     )
 
     def get_db_url(self) -> str:
-        return self._database_url("postgresql+asyncpg")
+        return self._database_url("postgresql+asyncpg", self.DB_HOST, self.DB_PORT)
+
+    def get_replica_db_url(self) -> str | None:
+        if not self.DB_REPLICA_HOST:
+            return None
+        return self._database_url(
+            "postgresql+asyncpg",
+            self.DB_REPLICA_HOST,
+            self.DB_REPLICA_PORT or self.DB_PORT,
+        )
 
     def get_sync_db_url(self) -> str:
-        return self._database_url("postgresql+psycopg")
+        return self._database_url("postgresql+psycopg", self.DB_HOST, self.DB_PORT)
 
-    def _database_url(self, drivername: str) -> str:
-        unix_socket = self.DB_HOST.startswith("/")
+    def _database_url(self, drivername: str, host: str, port: int) -> str:
+        unix_socket = host.startswith("/")
         return URL.create(
             drivername=drivername,
             username=self.DB_USER,
             password=self.DB_PASSWORD.get_secret_value(),
-            host=None if unix_socket else self.DB_HOST,
-            port=None if unix_socket else self.DB_PORT,
+            host=None if unix_socket else host,
+            port=None if unix_socket else port,
             database=self.DB_NAME,
-            query=(
-                {"host": self.DB_HOST, "port": str(self.DB_PORT)} if unix_socket else {}
-            ),
+            query={"host": host, "port": str(port)} if unix_socket else {},
         ).render_as_string(hide_password=False)
 
     @property
@@ -1,31 +1,293 @@
-from collections.abc import AsyncGenerator
+import hashlib
+import logging
+import time
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+from uuid import uuid4
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection, ExecutionContext
+from sqlalchemy.engine.interfaces import CacheStats
+from sqlalchemy.exc import InvalidRequestError, SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from main.config import settings
+from main.db.instrumentation import instrument_engine
+from main.metrics import DurationStats
+from main.services.cache import ExpiringLRUCache
+
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = settings.get_db_url()
+REPLICA_DATABASE_URL = settings.get_replica_db_url()
+READ_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+REPLICA_LAG_QUERY = text(
+    """
+    SELECT CASE
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()),
+            0
+        )
+    END
+    """
+)
 
 
-engine = create_async_engine(
-    url=DATABASE_URL,
-    echo=settings.SQL_ECHO,
-    pool_pre_ping=True,
-)
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    checkout_wait: DurationStats
+    timeouts: int
+
+    def _do_get(self):
+        started_at = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            type(self).timeouts += 1
+            raise
+        finally:
+            type(self).checkout_wait.observe(time.perf_counter() - started_at)
+
+
+def _instrumented_pool_class() -> type[InstrumentedQueuePool]:
+    return type(
+        "InstrumentedQueuePool",
+        (InstrumentedQueuePool,),
+        {"checkout_wait": DurationStats(), "timeouts": 0},
+    )
+
+
+@dataclass
+class StatementCacheStats:
+    hits: int = 0
+    misses: int = 0
+    uncached: int = 0
+
+    def observe(self, context: ExecutionContext) -> None:
+        cache_hit = getattr(context, "cache_hit", None)
+        if cache_hit is CacheStats.CACHE_HIT:
+            self.hits += 1
+        elif cache_hit is CacheStats.CACHE_MISS:
+            self.misses += 1
+        else:
+            self.uncached += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        cached = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "uncached": self.uncached,
+            "hit_ratio": round(self.hits / cached, 4) if cached else None,
+        }
+
+
+statement_cache_stats: dict[AsyncEngine, StatementCacheStats] = {}
+
+
+def _prepared_statement_name() -> str:
+    return f"__asyncpg_{uuid4()}__"
+
+
+def _connect_args() -> dict[str, Any]:
+    if settings.DB_PGBOUNCER:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _prepared_statement_name,
+        }
+    connect_args: dict[str, Any] = {
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        connect_args["server_settings"] = {
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)
+        }
+    return connect_args
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    target = create_async_engine(
+        url=url,
+        echo=settings.SQL_ECHO,
+        poolclass=_instrumented_pool_class(),
+        pool_pre_ping=True,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+        pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+        query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+        connect_args=_connect_args(),
+    )
+    instrument_engine(target.sync_engine)
+    stats = statement_cache_stats[target] = StatementCacheStats()
+
+    @event.listens_for(target.sync_engine, "after_cursor_execute")
+    def _observe_statement(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        stats.observe(context)
+
+    return target
+
+
+engine = _create_engine(DATABASE_URL)
+replica_engine = _create_engine(REPLICA_DATABASE_URL) if REPLICA_DATABASE_URL else None
+read_only_binds = {
+    target: target.execution_options(isolation_level="AUTOCOMMIT")
+    for target in (engine, replica_engine)
+    if target is not None
+}
+
+
+class TrackedSession(Session):
+    pass
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _track_statement(state: ORMExecuteState) -> None:
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+    if state.session.info.get("read_only"):
+        raise InvalidRequestError("Запись в сессии только для чтения запрещена")
+    state.session.info["has_writes"] = True
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _track_flush(session: Session, _: UOWTransaction) -> None:
+    session.info["has_writes"] = True
+
 
 async_session_maker = async_sessionmaker(
     engine,
     expire_on_commit=False,
     autoflush=False,
     class_=AsyncSession,
+    sync_session_class=TrackedSession,
+)
+
+
+@dataclass
+class ReplicaRouter:
+    replica: AsyncEngine | None
+    max_lag_seconds: float
+    sticky_seconds: int
+    lag_check_seconds: float
+    replica_healthy: bool = False
+    checked_at: float = float("-inf")
+    _sticky: ExpiringLRUCache = field(
+        default_factory=lambda: ExpiringLRUCache(maxsize=10_000),
+        init=False,
+        repr=False,
+    )
+
+    async def bind_for(self, request: Request) -> AsyncEngine:
+        if (
+            self.replica is None
+            or request.method not in READ_METHODS
+            or self._sticky.get(self._client_key(request)) is not None
+            or not await self._replica_usable()
+        ):
+            return engine
+        return self.replica
+
+    def mark_write(self, request: Request) -> None:
+        if self.replica is None or not self.sticky_seconds:
+            return
+        client_key = self._client_key(request)
+        if client_key is not None:
+            self._sticky.set(client_key, True, time.time() + self.sticky_seconds)
+
+    async def _replica_usable(self) -> bool:
+        if time.monotonic() - self.checked_at < self.lag_check_seconds:
+            return self.replica_healthy
+        self.checked_at = time.monotonic()
+        try:
+            async with self.replica.connect() as connection:
+                lag = float(await connection.scalar(REPLICA_LAG_QUERY) or 0)
+        except (SQLAlchemyError, OSError):
+            logger.warning("db_replica_unavailable", exc_info=True)
+            self.replica_healthy = False
+            return False
+        healthy = lag <= self.max_lag_seconds
+        if healthy != self.replica_healthy:
+            logger.info("db_replica_state healthy=%s lag_seconds=%.3f", healthy, lag)
+        self.replica_healthy = healthy
+        return healthy
+
+    @staticmethod
+    def _client_key(request: Request) -> bytes | None:
+        authorization = request.headers.get("authorization")
+        if not authorization:
+            return None
+        return hashlib.sha256(authorization.encode()).digest()
+
+
+replica_router = ReplicaRouter(
+    replica=replica_engine,
+    max_lag_seconds=settings.DB_REPLICA_MAX_LAG_SECONDS,
+    sticky_seconds=settings.DB_REPLICA_STICKY_SECONDS,
+    lag_check_seconds=settings.DB_REPLICA_LAG_CHECK_SECONDS,
 )
 
 
-async def get_async_session() -> AsyncGenerator[AsyncSession]:
-    async with async_session_maker() as session:
+def pool_snapshot(target: AsyncEngine) -> dict[str, Any]:
+    pool = target.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "timeouts": type(pool).timeouts,
+        "checkout_wait": type(pool).checkout_wait.snapshot(),
+        "statement_cache": statement_cache_stats[target].snapshot(),
+    }
+
+
+@asynccontextmanager
+async def _session_scope(
+    bind: AsyncEngine,
+    read_only: bool,
+) -> AsyncIterator[AsyncSession]:
+    async with async_session_maker(
+        bind=read_only_binds[bind] if read_only else bind,
+        info={"read_only": read_only},
+    ) as session:
         try:
             yield session
-            await session.commit()
+            if session.info.get("has_writes"):
+                await session.commit()
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_async_session(request: Request) -> AsyncGenerator[AsyncSession]:
+    read_only = request.method in READ_METHODS
+    bind = await replica_router.bind_for(request)
+    async with _session_scope(bind, read_only) as session:
+        yield session
+    if session.info.get("has_writes"):
+        replica_router.mark_write(request)
+
+
+async def get_primary_session() -> AsyncGenerator[AsyncSession]:
+    async with _session_scope(engine, read_only=False) as session:
+        yield session
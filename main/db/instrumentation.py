@@ -0,0 +1,95 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy import Engine, event
+from sqlalchemy.engine import Connection, ExecutionContext
+
+from main.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    request_id: str | None = None
+    count: int = 0
+    total_seconds: float = 0.0
+    slowest_seconds: float = 0.0
+    slowest_statement: str | None = None
+    statements: Counter[str] = field(default_factory=Counter, repr=False)
+
+    def observe(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total_seconds += elapsed
+        self.statements[statement] += 1
+        if elapsed >= self.slowest_seconds:
+            self.slowest_seconds = elapsed
+            self.slowest_statement = statement
+
+    def most_repeated(self) -> tuple[str | None, int]:
+        if not self.statements:
+            return None, 0
+        return self.statements.most_common(1)[0]
+
+
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats",
+    default=None,
+)
+
+
+def _one_line(statement: str) -> str:
+    return " ".join(statement.split())
+
+
+def instrument_engine(target: Engine) -> None:
+    @event.listens_for(target, "before_cursor_execute")
+    def _start_timer(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        context._query_started_at = time.perf_counter()
+
+    @event.listens_for(target, "after_cursor_execute")
+    def _record_timer(
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: ExecutionContext,
+        executemany: bool,
+    ) -> None:
+        started_at = getattr(context, "_query_started_at", None)
+        if started_at is None:
+            return
+        elapsed = time.perf_counter() - started_at
+        stats = current_query_stats.get()
+        if stats is not None:
+            stats.observe(statement, elapsed)
+        if settings.DB_SLOW_QUERY_MS and elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+            logger.warning(
+                "db_slow_query duration_ms=%.1f statement=%s",
+                elapsed * 1000,
+                _one_line(statement),
+                extra={"request_id": stats.request_id if stats else None},
+            )
+
+
+def log_request_queries(stats: QueryStats) -> None:
+    statement, repeats = stats.most_repeated()
+    if statement is None or repeats < settings.DB_REPEATED_STATEMENT_THRESHOLD:
+        return
+    logger.warning(
+        "db_repeated_statement repeats=%s statement=%s",
+        repeats,
+        _one_line(statement),
+        extra={"request_id": stats.request_id},
+    )
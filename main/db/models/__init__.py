@@ -1,4 +1,6 @@
 from main.db.models.rooms import Room
+from main.db.models.task_counters import TaskCounter
+from main.db.models.task_daily_completions import TaskDailyCompletion
 from main.db.models.tasks import Difficulty, Priority, Status, Task
 from main.db.models.teams import Team, TeamMember
 from main.db.models.teams_to_rooms import TeamToRoom
@@ -11,6 +13,8 @@ __all__ = [
     "Room",
     "Status",
     "Task",
+    "TaskCounter",
+    "TaskDailyCompletion",
     "Team",
     "TeamMember",
     "TeamToRoom",
@@ -0,0 +1,53 @@
+import uuid
+
+from sqlalchemy import BigInteger, ForeignKey, UniqueConstraint, Uuid, text
+from sqlalchemy import Enum as SAEnum
+from sqlalchemy.orm import Mapped, mapped_column
+
+from main.db.base import Base
+from main.db.models.tasks import Status
+
+
+class TaskCounter(Base):
+    __tablename__ = "task_counters"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        Uuid, primary_key=True, default=uuid.uuid4, comment="гуид"
+    )
+    team_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid,
+        ForeignKey("teams_to_rooms.team_id"),
+        nullable=False,
+        comment="гуид команды",
+    )
+    executor: Mapped[uuid.UUID | None] = mapped_column(
+        Uuid, ForeignKey("users.user_id"), nullable=True, comment="исполнитель"
+    )
+    status: Mapped[Status] = mapped_column(
+        SAEnum(
+            Status,
+            name="status",
+            values_callable=lambda enum: [member.value for member in enum],
+            validate_strings=True,
+            create_type=False,
+        ),
+        nullable=False,
+        comment="статус задач",
+    )
+    task_count: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default=text("0"),
+        comment="количество неудалённых задач",
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "team_id",
+            "executor",
+            "status",
+            name="uix_task_counters_team_executor_status",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
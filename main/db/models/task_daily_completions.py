@@ -0,0 +1,44 @@
+import uuid
+from datetime import date
+
+from sqlalchemy import BigInteger, Date, ForeignKey, UniqueConstraint, Uuid, text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from main.db.base import Base
+
+
+class TaskDailyCompletion(Base):
+    __tablename__ = "task_daily_completions"
+
+    id: Mapped[uuid.UUID] = mapped_column(
+        Uuid, primary_key=True, default=uuid.uuid4, comment="гуид"
+    )
+    team_id: Mapped[uuid.UUID] = mapped_column(
+        Uuid,
+        ForeignKey("teams_to_rooms.team_id"),
+        nullable=False,
+        comment="гуид команды",
+    )
+    executor: Mapped[uuid.UUID | None] = mapped_column(
+        Uuid, ForeignKey("users.user_id"), nullable=True, comment="исполнитель"
+    )
+    day: Mapped[date] = mapped_column(
+        Date, nullable=False, comment="день завершения по UTC"
+    )
+    completed_count: Mapped[int] = mapped_column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        server_default=text("0"),
+        comment="количество завершённых задач",
+    )
+
+    __table_args__ = (
+        UniqueConstraint(
+            "team_id",
+            "executor",
+            "day",
+            name="uix_task_daily_completions_team_executor_day",
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
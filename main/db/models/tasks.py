@@ -2,7 +2,18 @@ import uuid
 from datetime import datetime
 from enum import Enum
 
-from sqlalchemy import TIMESTAMP, CheckConstraint, ForeignKey, Index, String, Uuid, func
+from sqlalchemy import (
+    TIMESTAMP,
+    CheckConstraint,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Uuid,
+    desc,
+    func,
+    text,
+)
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -31,6 +42,11 @@ class Status(str, Enum):
     canceled = "canceled"
 
 
+LIVE_PREDICATE = "deleted_at IS NULL"
+OPEN_PREDICATE = "status IN ('unassigned', 'assigned', 'in_progress')"
+COMPLETED_PREDICATE = "status = 'completed'"
+
+
 class Task(Base):
     __tablename__ = "tasks"
 
@@ -121,6 +137,13 @@ class Task(Base):
         nullable=True,
         comment="пользователь, удаливший задачу",
     )
+    version: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=1,
+        server_default=text("1"),
+        comment="версия задачи для оптимистичной блокировки",
+    )
 
     __table_args__ = (
         CheckConstraint(
@@ -132,7 +155,34 @@ class Task(Base):
             "status <> 'completed' OR task_finish_date IS NOT NULL",
             name="ck_tasks_completed_finish",
         ),
-        Index("ix_tasks_team_status", "team_id", "status"),
         Index("ix_tasks_executor_status", "executor", "status"),
-        Index("ix_tasks_team_finish_date", "team_id", "task_finish_date"),
+        Index(
+            "ix_tasks_team_created_live",
+            "team_id",
+            desc(task_create_date),
+            "task_id",
+            postgresql_where=text(LIVE_PREDICATE),
+        ),
+        Index(
+            "ix_tasks_team_executor_created_live",
+            "team_id",
+            "executor",
+            desc(task_create_date),
+            "task_id",
+            postgresql_where=text(LIVE_PREDICATE),
+        ),
+        Index(
+            "ix_tasks_team_open",
+            "team_id",
+            "executor",
+            postgresql_include=["priority", "difficulty", "task_deadline_date"],
+            postgresql_where=text(f"{LIVE_PREDICATE} AND {OPEN_PREDICATE}"),
+        ),
+        Index(
+            "ix_tasks_team_completed_finish",
+            "team_id",
+            "task_finish_date",
+            postgresql_include=["executor"],
+            postgresql_where=text(f"{LIVE_PREDICATE} AND {COMPLETED_PREDICATE}"),
+        ),
     )
@@ -1,19 +1,23 @@
 import logging
+import math
 from contextlib import asynccontextmanager
 
 import sentry_sdk
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from redis.exceptions import RedisError
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from starlette.middleware.trustedhost import TrustedHostMiddleware
 
 from main.api import auth, health, room, tasks, team_management
 from main.config import settings
-from main.db.connect import engine
+from main.db.connect import engine, replica_engine
 from main.logging import configure_logging
 from main.middleware import RequestContextMiddleware
 from main.redis import redis_client
+from main.services.hashing import password_hash_pool
 
 configure_logging(settings.ENVIRONMENT)
 logger = logging.getLogger(__name__)
@@ -33,6 +37,9 @@ async def lifespan(_: FastAPI):
     yield
     await redis_client.aclose()
     await engine.dispose()
+    if replica_engine is not None:
+        await replica_engine.dispose()
+    password_hash_pool.shutdown()
     logger.info("application_stopped")
 
 
@@ -56,7 +63,15 @@ if settings.cors_origins:
         allow_origins=settings.cors_origins,
         allow_credentials="*" not in settings.cors_origins,
         allow_methods=["GET", "POST", "PATCH", "DELETE"],
-        allow_headers=["Authorization", "Content-Type", "X-Request-ID"],
+        allow_headers=[
+            "Authorization",
+            "Content-Type",
+            "X-Request-ID",
+            "If-Match",
+            "If-None-Match",
+            "Prefer",
+        ],
+        expose_headers=["ETag", "Preference-Applied"],
     )
 
 
@@ -65,6 +80,17 @@ async def sqlalchemy_exception_handler(
     request: Request,
     exc: SQLAlchemyError,
 ) -> JSONResponse:
+    if isinstance(exc, PoolTimeoutError):
+        logger.warning(
+            "db_pool_exhausted path=%s request_id=%s",
+            request.url.path,
+            getattr(request.state, "request_id", None),
+        )
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "База данных перегружена, повторите позже"},
+            headers={"Retry-After": "1"},
+        )
     logger.exception(
         "database_error path=%s request_id=%s",
         request.url.path,
@@ -77,6 +103,21 @@ async def sqlalchemy_exception_handler(
     )
 
 
+@app.exception_handler(RedisError)
+async def redis_exception_handler(request: Request, exc: RedisError) -> JSONResponse:
+    logger.warning(
+        "redis_error path=%s request_id=%s error=%s",
+        request.url.path,
+        getattr(request.state, "request_id", None),
+        exc.__class__.__name__,
+    )
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Сервис авторизации временно недоступен"},
+        headers={"Retry-After": str(math.ceil(settings.REDIS_BREAKER_RESET_SECONDS))},
+    )
+
+
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(room.router, prefix="/api/v1")
 app.include_router(team_management.router, prefix="/api/v1")
@@ -0,0 +1,21 @@
+from dataclasses import dataclass
+
+
+@dataclass
+class DurationStats:
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+
+    def snapshot(self) -> dict[str, float]:
+        average = self.total_seconds / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "avg_ms": round(average * 1000, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+        }
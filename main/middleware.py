@@ -1,9 +1,19 @@
+import logging
+import time
 import uuid
 
 from fastapi import Request
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.responses import JSONResponse, Response
 
+from main.db.instrumentation import (
+    QueryStats,
+    current_query_stats,
+    log_request_queries,
+)
+
+logger = logging.getLogger(__name__)
+
 
 class RequestContextMiddleware(BaseHTTPMiddleware):
     def __init__(self, app, max_body_bytes: int) -> None:
@@ -34,7 +44,33 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
                     headers={"X-Request-ID": request_id},
                 )
 
-        response = await call_next(request)
+        started_at = time.perf_counter()
+        stats = QueryStats(request_id=request_id)
+        token = current_query_stats.set(stats)
+        try:
+            response = await call_next(request)
+        finally:
+            current_query_stats.reset(token)
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        db_ms = stats.total_seconds * 1000
+
+        response.headers["Server-Timing"] = (
+            f'db;dur={db_ms:.1f};desc="{stats.count} queries", '
+            f"app;dur={elapsed_ms:.1f}"
+        )
+        logger.info(
+            "request_completed method=%s path=%s status=%s duration_ms=%.1f "
+            "db_queries=%s db_ms=%.1f db_slowest_ms=%.1f",
+            request.method,
+            request.url.path,
+            response.status_code,
+            elapsed_ms,
+            stats.count,
+            db_ms,
+            stats.slowest_seconds * 1000,
+            extra={"request_id": request_id},
+        )
+        log_request_queries(stats)
         response.headers["X-Request-ID"] = request_id
         response.headers["X-Content-Type-Options"] = "nosniff"
         response.headers["X-Frame-Options"] = "DENY"
@@ -1,12 +1,99 @@
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
 import redis.asyncio as redis
+from redis.exceptions import RedisError
 
 from main.config import settings
 
+logger = logging.getLogger(__name__)
+
 redis_client = redis.from_url(
     settings.REDIS_URL,
     decode_responses=True,
     encoding="utf-8",
-    socket_connect_timeout=3,
-    socket_timeout=3,
+    socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+    socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
     health_check_interval=30,
 )
+
+
+class CircuitOpenError(RedisError):
+    pass
+
+
+@dataclass
+class RedisCircuitBreaker:
+    failure_threshold: int
+    reset_timeout_seconds: float
+    slow_call_seconds: float
+    failures: int = 0
+    opened_at: float | None = None
+    probing: bool = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if self.probing else "open"
+
+    async def call(
+        self,
+        func: Callable[..., Awaitable[Any]],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        if not self._allow_request():
+            raise CircuitOpenError("Redis circuit breaker is open")
+        started_at = time.monotonic()
+        try:
+            result = await func(*args, **kwargs)
+        except RedisError:
+            self._record_failure()
+            raise
+        except BaseException:
+            self.probing = False
+            raise
+        if time.monotonic() - started_at > self.slow_call_seconds:
+            self._record_failure()
+        else:
+            self._record_success()
+        return result
+
+    def snapshot(self) -> dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures}
+
+    def _allow_request(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if self.probing:
+            return False
+        if time.monotonic() - self.opened_at < self.reset_timeout_seconds:
+            return False
+        self.probing = True
+        return True
+
+    def _record_failure(self) -> None:
+        self.failures += 1
+        if self.probing or self.failures >= self.failure_threshold:
+            if self.opened_at is None:
+                logger.warning("redis_circuit_opened failures=%s", self.failures)
+            self.opened_at = time.monotonic()
+            self.probing = False
+
+    def _record_success(self) -> None:
+        if self.opened_at is not None:
+            logger.info("redis_circuit_closed")
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+
+
+redis_breaker = RedisCircuitBreaker(
+    failure_threshold=settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout_seconds=settings.REDIS_BREAKER_RESET_SECONDS,
+    slow_call_seconds=settings.REDIS_SLOW_CALL_SECONDS,
+)
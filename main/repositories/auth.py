@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import exists, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from main.db.models.users import User
@@ -38,3 +38,19 @@ class AuthRegUserRepository:
         )
         result = await self.db.execute(stmt)
         return result.scalar_one_or_none()
+
+    async def is_active_user(self, user_id: UUID) -> bool:
+        result = await self.db.execute(
+            select(
+                exists().where(
+                    User.user_id == user_id,
+                    User.is_deleted.is_(False),
+                )
+            )
+        )
+        return bool(result.scalar())
+
+    async def update_password_hash(self, user_id: UUID, password_hash: str) -> None:
+        await self.db.execute(
+            update(User).where(User.user_id == user_id).values(password=password_hash)
+        )
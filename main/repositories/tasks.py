@@ -1,67 +1,159 @@
+from collections import Counter
+from collections.abc import Collection, Sequence
 from dataclasses import dataclass
-from datetime import datetime
-from uuid import UUID
+from datetime import UTC, date, datetime
+from typing import Any
+from uuid import UUID, uuid4
 
-from sqlalchemy import exists, func, select, update
+from sqlalchemy import (
+    ColumnElement,
+    Date,
+    Row,
+    ScalarSelect,
+    Select,
+    and_,
+    bindparam,
+    case,
+    cast,
+    exists,
+    func,
+    insert,
+    lambda_stmt,
+    literal,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from main.db.models.tasks import Status, Task
+from main.db.base import Base
+from main.db.models.task_counters import TaskCounter
+from main.db.models.task_daily_completions import TaskDailyCompletion
+from main.db.models.tasks import Difficulty, Priority, Status, Task
 from main.db.models.teams import TeamMember
 from main.db.models.teams_to_rooms import TeamToRoom
 from main.db.models.users import User
-from main.schemas.tasks import TaskCreate
+from main.schemas.tasks import TaskCreate, TaskSeriesBucket
 
 OPEN_STATUSES = (Status.unassigned, Status.assigned, Status.in_progress)
+# Rendered inline so that prepared generic plans can still match the partial
+# indexes on open and completed tasks.
+IS_OPEN = Task.status.in_(
+    bindparam(
+        "open_statuses",
+        list(OPEN_STATUSES),
+        expanding=True,
+        literal_execute=True,
+    )
+)
+IS_COMPLETED = Task.status == literal(
+    Status.completed,
+    Task.status.type,
+    literal_execute=True,
+)
+
+TASK_COLUMNS = tuple(Task.__table__.c)
+CHANGE_COLUMNS = (Task.task_id, Task.team_id, Task.executor, Task.status, Task.version)
+
+TaskSortKey = tuple[datetime, UUID]
+CounterKey = tuple[UUID, UUID | None, Status]
+CompletionKey = tuple[UUID, UUID | None, date]
+
+
+def completion_day(finished_at: datetime) -> date:
+    return finished_at.astimezone(UTC).date()
+
+
+@dataclass(frozen=True)
+class TeamAccess:
+    team_id: UUID
+    members: dict[UUID, bool]
+
+    def is_member(self, user_id: UUID) -> bool:
+        return user_id in self.members
+
+    def is_chief(self, user_id: UUID) -> bool:
+        return self.members.get(user_id, False)
 
 
 @dataclass
 class TaskRepository:
     db: AsyncSession
 
-    async def get_task(self, task_id: UUID) -> Task | None:
-        result = await self.db.execute(
-            select(Task).where(
-                Task.task_id == task_id,
-                Task.deleted_at.is_(None),
-            )
-        )
-        return result.scalar_one_or_none()
-
-    async def check_user_exists(self, user_id: UUID) -> bool:
+    async def get_team_access(
+        self,
+        team_id: UUID,
+        user_ids: set[UUID],
+    ) -> TeamAccess | None:
+        member_ids = tuple(user_ids)
         result = await self.db.execute(
-            select(
-                exists().where(
-                    User.user_id == user_id,
-                    User.is_deleted.is_(False),
+            lambda_stmt(
+                lambda: select(TeamMember.user_id, TeamMember.is_chief)
+                .select_from(TeamToRoom)
+                .outerjoin(
+                    TeamMember,
+                    and_(
+                        TeamMember.team_id == TeamToRoom.team_id,
+                        TeamMember.user_id.in_(member_ids),
+                    ),
                 )
+                .where(TeamToRoom.team_id == team_id)
             )
         )
-        return bool(result.scalar())
-
-    async def check_team_exists(self, team_id: UUID) -> bool:
-        result = await self.db.execute(
-            select(exists().where(TeamToRoom.team_id == team_id))
+        rows = result.all()
+        if not rows:
+            return None
+        return TeamAccess(
+            team_id=team_id,
+            members={
+                user_id: is_chief for user_id, is_chief in rows if user_id is not None
+            },
         )
-        return bool(result.scalar())
 
-    async def check_user_is_chief(self, user_id: UUID, team_id: UUID) -> bool:
+    async def get_task_access(
+        self,
+        task_id: UUID,
+        user_ids: set[UUID],
+    ) -> tuple[Task, TeamAccess] | None:
+        member_ids = tuple(user_ids)
         result = await self.db.execute(
-            select(
-                exists().where(
-                    TeamMember.user_id == user_id,
-                    TeamMember.team_id == team_id,
-                    TeamMember.is_chief.is_(True),
+            lambda_stmt(
+                lambda: select(Task, TeamMember.user_id, TeamMember.is_chief)
+                .outerjoin(
+                    TeamMember,
+                    and_(
+                        TeamMember.team_id == Task.team_id,
+                        TeamMember.user_id.in_(member_ids),
+                    ),
+                )
+                .where(
+                    Task.task_id == task_id,
+                    Task.deleted_at.is_(None),
                 )
             )
         )
-        return bool(result.scalar())
+        rows = result.all()
+        if not rows:
+            return None
+        task = rows[0][0]
+        return task, TeamAccess(
+            team_id=task.team_id,
+            members={
+                user_id: is_chief
+                for _, user_id, is_chief in rows
+                if user_id is not None
+            },
+        )
 
-    async def check_user_in_team(self, user_id: UUID, team_id: UUID) -> bool:
+    async def check_user_exists(self, user_id: UUID) -> bool:
         result = await self.db.execute(
-            select(
-                exists().where(
-                    TeamMember.team_id == team_id,
-                    TeamMember.user_id == user_id,
+            lambda_stmt(
+                lambda: select(
+                    exists().where(
+                        User.user_id == user_id,
+                        User.is_deleted.is_(False),
+                    )
                 )
             )
         )
@@ -73,11 +165,13 @@ class TaskRepository:
         task_id: UUID,
     ) -> bool:
         result = await self.db.execute(
-            select(
-                exists().where(
-                    Task.task_id == task_id,
-                    Task.author == user_id,
-                    Task.deleted_at.is_(None),
+            lambda_stmt(
+                lambda: select(
+                    exists().where(
+                        Task.task_id == task_id,
+                        Task.author == user_id,
+                        Task.deleted_at.is_(None),
+                    )
                 )
             )
         )
@@ -90,23 +184,63 @@ class TaskRepository:
         author_id: UUID,
         task_status: Status,
         now: datetime,
-    ) -> UUID:
-        task = Task(
-            team_id=team_id,
-            task_name=data.task_name,
-            task_text=data.task_text,
-            author=author_id,
-            executor=data.executor,
-            priority=data.priority,
-            status=task_status,
-            difficulty=data.difficulty,
-            task_create_date=now,
-            task_update_author=author_id,
-            task_deadline_date=data.task_deadline_date,
-        )
-        self.db.add(task)
-        await self.db.flush()
-        return task.task_id
+    ) -> Row:
+        result = await self.db.execute(
+            insert(Task)
+            .values(self._task_values(data, team_id, author_id, task_status, now))
+            .returning(*TASK_COLUMNS)
+        )
+        row = result.one()
+        await self._apply_counter_deltas(
+            Counter({(team_id, row.executor, row.status): 1})
+        )
+        return row
+
+    async def create_tasks(
+        self,
+        items: list[TaskCreate],
+        team_id: UUID,
+        author_id: UUID,
+        now: datetime,
+    ) -> list[UUID]:
+        rows = [
+            self._task_values(
+                data,
+                team_id,
+                author_id,
+                Status.assigned if data.executor else Status.unassigned,
+                now,
+            )
+            for data in items
+        ]
+        await self.db.execute(insert(Task).values(rows))
+        await self._apply_counter_deltas(
+            Counter((team_id, row["executor"], row["status"]) for row in rows)
+        )
+        return [row["task_id"] for row in rows]
+
+    @staticmethod
+    def _task_values(
+        data: TaskCreate,
+        team_id: UUID,
+        author_id: UUID,
+        task_status: Status,
+        now: datetime,
+    ) -> dict[str, Any]:
+        return {
+            "task_id": uuid4(),
+            "team_id": team_id,
+            "task_name": data.task_name,
+            "task_text": data.task_text,
+            "author": author_id,
+            "executor": data.executor,
+            "priority": data.priority,
+            "status": task_status,
+            "difficulty": data.difficulty,
+            "task_create_date": now,
+            "task_update_author": author_id,
+            "task_deadline_date": data.task_deadline_date,
+        }
 
     async def update_task(
         self,
@@ -114,21 +248,35 @@ class TaskRepository:
         updated_data: dict,
         author_id: UUID,
         now: datetime,
-    ) -> UUID:
+    ) -> Row | None:
         if "executor" in updated_data and updated_data["executor"] != task.executor:
             updated_data["last_executor"] = task.executor
         updated_data["task_update_date"] = now
         updated_data["task_update_author"] = author_id
-        await self.db.execute(
-            update(Task)
-            .where(
+        rows = await self._update_with_counters(
+            [
                 Task.task_id == task.task_id,
                 Task.deleted_at.is_(None),
+                Task.version == task.version,
+            ],
+            updated_data,
+            TASK_COLUMNS,
+        )
+        return rows[0] if rows else None
+
+    async def get_task_states(
+        self,
+        team_id: UUID,
+        task_ids: Collection[UUID],
+    ) -> dict[UUID, Row]:
+        result = await self.db.execute(
+            select(Task.task_id, Task.author, Task.executor, Task.status).where(
+                Task.team_id == team_id,
+                Task.task_id.in_(task_ids),
+                Task.deleted_at.is_(None),
             )
-            .values(**updated_data)
         )
-        await self.db.flush()
-        return task.task_id
+        return {row.task_id: row for row in result}
 
     async def soft_delete_task(
         self,
@@ -136,39 +284,236 @@ class TaskRepository:
         actor_id: UUID,
         now: datetime,
     ) -> bool:
+        return bool(await self.soft_delete_tasks([task_id], actor_id, now))
+
+    async def soft_delete_tasks(
+        self,
+        task_ids: Collection[UUID],
+        actor_id: UUID,
+        now: datetime,
+    ) -> list[UUID]:
         result = await self.db.execute(
             update(Task)
             .where(
-                Task.task_id == task_id,
+                Task.task_id.in_(task_ids),
                 Task.deleted_at.is_(None),
             )
-            .values(deleted_at=now, deleted_by=actor_id)
+            .values(deleted_at=now, deleted_by=actor_id, version=Task.version + 1)
+            .returning(
+                Task.task_id,
+                Task.team_id,
+                Task.executor,
+                Task.status,
+                Task.task_finish_date,
+            )
+            .execution_options(synchronize_session=False)
         )
-        await self.db.flush()
-        return bool(result.rowcount)
+        rows = result.all()
+        removed: Counter[CounterKey] = Counter()
+        removed.subtract((row.team_id, row.executor, row.status) for row in rows)
+        await self._apply_counter_deltas(removed)
+        uncompleted: Counter[CompletionKey] = Counter()
+        uncompleted.subtract(
+            (row.team_id, row.executor, completion_day(row.task_finish_date))
+            for row in rows
+            if row.status == Status.completed and row.task_finish_date
+        )
+        await self._apply_completion_deltas(uncompleted)
+        return [row.task_id for row in rows]
 
     async def complete_task(
         self,
         task_id: UUID,
         actor_id: UUID,
         now: datetime,
-    ) -> bool:
-        result = await self.db.execute(
-            update(Task)
-            .where(
-                Task.task_id == task_id,
+        versions: Collection[int] | None,
+    ) -> Row | None:
+        filters = [Task.task_id == task_id]
+        if versions is not None:
+            filters.append(Task.version.in_(versions))
+        rows = await self._complete(filters, actor_id, now, TASK_COLUMNS)
+        return rows[0] if rows else None
+
+    async def complete_tasks(
+        self,
+        task_ids: Collection[UUID],
+        actor_id: UUID,
+        now: datetime,
+    ) -> list[UUID]:
+        rows = await self._complete(
+            [Task.task_id.in_(task_ids)],
+            actor_id,
+            now,
+            CHANGE_COLUMNS,
+        )
+        return [row.task_id for row in rows]
+
+    async def _complete(
+        self,
+        filters: list,
+        actor_id: UUID,
+        now: datetime,
+        columns: Sequence[ColumnElement],
+    ) -> Sequence[Row]:
+        actor_in_team = (
+            TeamMember.team_id == Task.team_id,
+            TeamMember.user_id == actor_id,
+        )
+        rows = await self._update_with_counters(
+            [
+                *filters,
+                exists().where(*actor_in_team),
+                or_(
+                    Task.executor == actor_id,
+                    exists().where(*actor_in_team, TeamMember.is_chief.is_(True)),
+                ),
                 Task.deleted_at.is_(None),
                 Task.status.in_(OPEN_STATUSES),
+                Task.executor.is_not(None),
+            ],
+            {
+                "status": Status.completed,
+                "task_finish_date": now,
+                "task_update_date": now,
+                "task_update_author": actor_id,
+            },
+            columns,
+        )
+        await self._apply_completion_deltas(
+            Counter((row.team_id, row.executor, completion_day(now)) for row in rows)
+        )
+        return rows
+
+    async def cancel_tasks(
+        self,
+        task_ids: Collection[UUID],
+        actor_id: UUID,
+        now: datetime,
+    ) -> list[UUID]:
+        rows = await self._update_with_counters(
+            [
+                Task.task_id.in_(task_ids),
+                Task.deleted_at.is_(None),
+                Task.status.in_(OPEN_STATUSES),
+            ],
+            {
+                "status": Status.canceled,
+                "task_finish_date": now,
+                "task_update_date": now,
+                "task_update_author": actor_id,
+            },
+        )
+        return [row.task_id for row in rows]
+
+    async def reassign_tasks(
+        self,
+        task_ids: Collection[UUID],
+        executor: UUID | None,
+        actor_id: UUID,
+        now: datetime,
+    ) -> list[UUID]:
+        rows = await self._update_with_counters(
+            [
+                Task.task_id.in_(task_ids),
+                Task.deleted_at.is_(None),
+                Task.status.in_(OPEN_STATUSES),
+            ],
+            {
+                "executor": executor,
+                "last_executor": case(
+                    (Task.executor.is_distinct_from(executor), Task.executor),
+                    else_=Task.last_executor,
+                ),
+                "status": Status.assigned if executor else Status.unassigned,
+                "task_update_date": now,
+                "task_update_author": actor_id,
+            },
+        )
+        return [row.task_id for row in rows]
+
+    async def _update_with_counters(
+        self,
+        filters: list,
+        values: dict,
+        columns: Sequence[ColumnElement] = CHANGE_COLUMNS,
+    ) -> Sequence[Row]:
+        old = (
+            select(Task.task_id, Task.executor, Task.status)
+            .where(*filters)
+            .order_by(Task.task_id)
+            .with_for_update()
+            .cte("old")
+        )
+        result = await self.db.execute(
+            update(Task)
+            .where(Task.task_id == old.c.task_id)
+            .values(**values, version=Task.version + 1)
+            .returning(
+                *columns,
+                old.c.executor.label("old_executor"),
+                old.c.status.label("old_status"),
             )
-            .values(
-                status=Status.completed,
-                task_finish_date=now,
-                task_update_date=now,
-                task_update_author=actor_id,
+            .execution_options(synchronize_session=False)
+        )
+        deltas: Counter[CounterKey] = Counter()
+        rows = result.all()
+        for row in rows:
+            deltas[(row.team_id, row.old_executor, row.old_status)] -= 1
+            deltas[(row.team_id, row.executor, row.status)] += 1
+        await self._apply_counter_deltas(deltas)
+        return rows
+
+    async def _apply_counter_deltas(self, deltas: Counter[CounterKey]) -> None:
+        await self._upsert_deltas(
+            TaskCounter,
+            "uix_task_counters_team_executor_status",
+            ("team_id", "executor", "status"),
+            "task_count",
+            deltas,
+        )
+
+    async def _apply_completion_deltas(
+        self,
+        deltas: Counter[CompletionKey],
+    ) -> None:
+        await self._upsert_deltas(
+            TaskDailyCompletion,
+            "uix_task_daily_completions_team_executor_day",
+            ("team_id", "executor", "day"),
+            "completed_count",
+            deltas,
+        )
+
+    async def _upsert_deltas(
+        self,
+        model: type[Base],
+        constraint: str,
+        key_fields: tuple[str, ...],
+        count_field: str,
+        deltas: Counter,
+    ) -> None:
+        values = [
+            {
+                "id": uuid4(),
+                **dict(zip(key_fields, key, strict=True)),
+                count_field: delta,
+            }
+            for key, delta in sorted(
+                deltas.items(),
+                key=lambda item: tuple(str(part) for part in item[0]),
+            )
+            if delta
+        ]
+        if not values:
+            return
+        stmt = pg_insert(model).values(values)
+        count_column = getattr(model, count_field)
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                constraint=constraint,
+                set_={count_field: count_column + stmt.excluded[count_field]},
             )
         )
-        await self.db.flush()
-        return bool(result.rowcount)
 
     async def get_team_tasks(
         self,
@@ -178,7 +523,10 @@ class TaskRepository:
         end_date: datetime,
         limit: int,
         offset: int,
-    ) -> tuple[list[Task], int]:
+        after: TaskSortKey | None,
+        include_total: bool,
+        total_cap: int | None,
+    ) -> tuple[list[Task], int | None]:
         filters = [
             Task.team_id == team_id,
             Task.deleted_at.is_(None),
@@ -192,7 +540,14 @@ class TaskRepository:
                     Task.task_finish_date <= end_date,
                 ]
             )
-        return await self._get_tasks(filters, limit, offset)
+        return await self._get_tasks(
+            filters,
+            limit,
+            offset,
+            after,
+            include_total,
+            total_cap,
+        )
 
     async def get_user_tasks(
         self,
@@ -203,7 +558,10 @@ class TaskRepository:
         end_date: datetime,
         limit: int,
         offset: int,
-    ) -> tuple[list[Task], int]:
+        after: TaskSortKey | None,
+        include_total: bool,
+        total_cap: int | None,
+    ) -> tuple[list[Task], int | None]:
         filters = [
             Task.team_id == team_id,
             Task.executor == user_id,
@@ -218,73 +576,164 @@ class TaskRepository:
                     Task.task_finish_date <= end_date,
                 ]
             )
-        return await self._get_tasks(filters, limit, offset)
+        return await self._get_tasks(
+            filters,
+            limit,
+            offset,
+            after,
+            include_total,
+            total_cap,
+        )
 
     async def _get_tasks(
         self,
         filters: list,
         limit: int,
         offset: int,
-    ) -> tuple[list[Task], int]:
-        result = await self.db.execute(
+        after: TaskSortKey | None,
+        include_total: bool,
+        total_cap: int | None,
+    ) -> tuple[list[Task], int | None]:
+        page_filters = list(filters)
+        if after is not None:
+            created_at, task_id = after
+            page_filters.extend(
+                [
+                    Task.task_create_date <= created_at,
+                    or_(
+                        Task.task_create_date < created_at,
+                        and_(
+                            Task.task_create_date == created_at,
+                            Task.task_id > task_id,
+                        ),
+                    ),
+                ]
+            )
+        page = (
             select(Task)
-            .where(*filters)
+            .where(*page_filters)
             .order_by(Task.task_create_date.desc(), Task.task_id)
             .limit(limit)
             .offset(offset)
         )
-        total_result = await self.db.execute(
-            select(func.count(Task.task_id)).where(*filters)
-        )
-        return list(result.scalars().all()), int(total_result.scalar() or 0)
+        if not include_total:
+            result = await self.db.execute(page)
+            return list(result.scalars().all()), None
+
+        total = self._total_statement(filters, total_cap)
+        result = await self.db.execute(page.add_columns(total.scalar_subquery()))
+        rows = result.all()
+        if rows:
+            return [row[0] for row in rows], int(rows[0][1])
+        if offset or after is not None:
+            return [], int(await self.db.scalar(total) or 0)
+        return [], 0
+
+    @staticmethod
+    def _total_statement(filters: list, total_cap: int | None) -> Select:
+        if total_cap is None:
+            return select(func.count(Task.task_id)).where(*filters)
+        capped = select(Task.task_id).where(*filters).limit(total_cap + 1).subquery()
+        return select(func.count()).select_from(capped)
 
-    async def count_user_completed_tasks(
+    async def get_task_statistics(
         self,
         team_id: UUID,
-        user_id: UUID,
+        user_id: UUID | None,
         start_date: datetime,
         end_date: datetime,
-    ) -> int:
-        return await self._count_tasks(
-            Task.team_id == team_id,
-            Task.executor == user_id,
-            Task.status == Status.completed,
-            Task.deleted_at.is_(None),
-            Task.task_finish_date.between(start_date, end_date),
-        )
+        now: datetime,
+    ) -> dict[str, Any]:
+        counter_filters = [TaskCounter.team_id == team_id]
+        task_filters = [Task.team_id == team_id, Task.deleted_at.is_(None)]
+        if user_id is not None:
+            counter_filters.append(TaskCounter.executor == user_id)
+            task_filters.append(Task.executor == user_id)
 
-    async def count_user_in_progress_tasks(
-        self,
-        team_id: UUID,
-        user_id: UUID,
-    ) -> int:
-        return await self._count_tasks(
-            Task.team_id == team_id,
-            Task.executor == user_id,
-            Task.status.in_(OPEN_STATUSES),
-            Task.deleted_at.is_(None),
+        def counter_total(value: Status) -> ScalarSelect:
+            return (
+                select(func.coalesce(func.sum(TaskCounter.task_count), 0))
+                .where(*counter_filters, TaskCounter.status == value)
+                .scalar_subquery()
+            )
+
+        columns = [
+            func.count()
+            .filter(
+                IS_COMPLETED,
+                Task.task_finish_date.between(start_date, end_date),
+            )
+            .label("completed"),
+            func.count()
+            .filter(IS_OPEN, Task.task_deadline_date < now)
+            .label("overdue"),
+        ]
+        columns.extend(
+            counter_total(value).label(f"status_{value.value}") for value in Status
+        )
+        columns.extend(
+            func.count()
+            .filter(IS_OPEN, Task.priority == value)
+            .label(f"priority_{value.value}")
+            for value in Priority
+        )
+        columns.extend(
+            func.count()
+            .filter(IS_OPEN, Task.difficulty == value)
+            .label(f"difficulty_{value.value}")
+            for value in Difficulty
+        )
+        result = await self.db.execute(
+            select(*columns).where(
+                *task_filters,
+                or_(
+                    IS_OPEN,
+                    and_(
+                        IS_COMPLETED,
+                        Task.task_finish_date.between(start_date, end_date),
+                    ),
+                ),
+            )
         )
+        row = result.mappings().one()
+        by_status = {value: int(row[f"status_{value.value}"]) for value in Status}
+        return {
+            "completed": row["completed"],
+            "in_progress": sum(by_status[value] for value in OPEN_STATUSES),
+            "overdue": row["overdue"],
+            "by_status": by_status,
+            "open_by_priority": {
+                value: row[f"priority_{value.value}"] for value in Priority
+            },
+            "open_by_difficulty": {
+                value: row[f"difficulty_{value.value}"] for value in Difficulty
+            },
+        }
 
-    async def count_team_completed_tasks(
+    async def get_completion_series(
         self,
         team_id: UUID,
-        start_date: datetime,
-        end_date: datetime,
-    ) -> int:
-        return await self._count_tasks(
-            Task.team_id == team_id,
-            Task.status == Status.completed,
-            Task.deleted_at.is_(None),
-            Task.task_finish_date.between(start_date, end_date),
-        )
-
-    async def count_team_in_progress_tasks(self, team_id: UUID) -> int:
-        return await self._count_tasks(
-            Task.team_id == team_id,
-            Task.status.in_(OPEN_STATUSES),
-            Task.deleted_at.is_(None),
+        user_id: UUID | None,
+        bucket: TaskSeriesBucket,
+        start_day: date,
+        end_day: date,
+    ) -> dict[date, int]:
+        bucket_start = cast(
+            func.date_trunc(
+                literal(bucket.value, literal_execute=True),
+                TaskDailyCompletion.day,
+            ),
+            Date,
+        ).label("bucket_start")
+        filters = [
+            TaskDailyCompletion.team_id == team_id,
+            TaskDailyCompletion.day.between(start_day, end_day),
+        ]
+        if user_id is not None:
+            filters.append(TaskDailyCompletion.executor == user_id)
+        result = await self.db.execute(
+            select(bucket_start, func.sum(TaskDailyCompletion.completed_count))
+            .where(*filters)
+            .group_by(bucket_start)
         )
-
-    async def _count_tasks(self, *filters) -> int:
-        result = await self.db.execute(select(func.count(Task.task_id)).where(*filters))
-        return int(result.scalar() or 0)
+        return {bucket_day: int(total) for bucket_day, total in result.all()}
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from uuid import UUID
 
-from sqlalchemy import delete, exists, select
+from sqlalchemy import delete, exists, lambda_stmt, select
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -18,12 +18,14 @@ class RoomTeamRepository:
     db: AsyncSession
 
     async def room_exists(self, room_id: UUID) -> bool:
-        result = await self.db.execute(select(exists().where(Room.room_id == room_id)))
+        result = await self.db.execute(
+            lambda_stmt(lambda: select(exists().where(Room.room_id == room_id)))
+        )
         return bool(result.scalar())
 
     async def team_exists(self, team_id: UUID) -> bool:
         result = await self.db.execute(
-            select(exists().where(TeamToRoom.team_id == team_id))
+            lambda_stmt(lambda: select(exists().where(TeamToRoom.team_id == team_id)))
         )
         return bool(result.scalar())
 
@@ -40,10 +42,12 @@ class RoomTeamRepository:
 
     async def is_room_member(self, user_id: UUID, room_id: UUID) -> bool:
         result = await self.db.execute(
-            select(
-                exists().where(
-                    UsersToRooms.user_id == user_id,
-                    UsersToRooms.room_id == room_id,
+            lambda_stmt(
+                lambda: select(
+                    exists().where(
+                        UsersToRooms.user_id == user_id,
+                        UsersToRooms.room_id == room_id,
+                    )
                 )
             )
         )
@@ -51,11 +55,13 @@ class RoomTeamRepository:
 
     async def is_room_chief(self, user_id: UUID, room_id: UUID) -> bool:
         result = await self.db.execute(
-            select(
-                exists().where(
-                    UsersToRooms.user_id == user_id,
-                    UsersToRooms.room_id == room_id,
-                    UsersToRooms.is_chief.is_(True),
+            lambda_stmt(
+                lambda: select(
+                    exists().where(
+                        UsersToRooms.user_id == user_id,
+                        UsersToRooms.room_id == room_id,
+                        UsersToRooms.is_chief.is_(True),
+                    )
                 )
             )
         )
@@ -63,10 +69,12 @@ class RoomTeamRepository:
 
     async def is_team_member(self, user_id: UUID, team_id: UUID) -> bool:
         result = await self.db.execute(
-            select(
-                exists().where(
-                    TeamMember.user_id == user_id,
-                    TeamMember.team_id == team_id,
+            lambda_stmt(
+                lambda: select(
+                    exists().where(
+                        TeamMember.user_id == user_id,
+                        TeamMember.team_id == team_id,
+                    )
                 )
             )
         )
@@ -74,11 +82,13 @@ class RoomTeamRepository:
 
     async def is_team_chief(self, user_id: UUID, team_id: UUID) -> bool:
         result = await self.db.execute(
-            select(
-                exists().where(
-                    TeamMember.user_id == user_id,
-                    TeamMember.team_id == team_id,
-                    TeamMember.is_chief.is_(True),
+            lambda_stmt(
+                lambda: select(
+                    exists().where(
+                        TeamMember.user_id == user_id,
+                        TeamMember.team_id == team_id,
+                        TeamMember.is_chief.is_(True),
+                    )
                 )
             )
         )
@@ -86,7 +96,9 @@ class RoomTeamRepository:
 
     async def get_room_id_for_team(self, team_id: UUID) -> UUID | None:
         result = await self.db.execute(
-            select(TeamToRoom.room_id).where(TeamToRoom.team_id == team_id)
+            lambda_stmt(
+                lambda: select(TeamToRoom.room_id).where(TeamToRoom.team_id == team_id)
+            )
         )
         return result.scalar_one_or_none()
 
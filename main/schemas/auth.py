@@ -1,4 +1,5 @@
 import uuid
+from datetime import datetime
 
 from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
 
@@ -68,6 +69,17 @@ class UserProfileOut(BaseModel):
     patronymic_name: str | None = None
 
 
+class SessionOut(BaseModel):
+    session_id: str
+    device: str | None = None
+    issued_at: datetime
+    expires_at: datetime
+
+
+class SessionListOut(BaseModel):
+    items: list[SessionOut]
+
+
 class LogoutRequest(BaseModel):
     refresh_token: str = Field(min_length=20)
 
@@ -1,4 +1,5 @@
-from datetime import datetime
+from datetime import date, datetime
+from enum import Enum
 from uuid import UUID
 
 from pydantic import (
@@ -55,10 +56,62 @@ class TaskUpdate(BaseModel):
         return value.strip() if value is not None else None
 
 
+class TaskBatchCreate(BaseModel):
+    items: list[TaskCreate] = Field(min_length=1, max_length=500)
+    atomic: bool = True
+
+
+class TaskBulkOperation(str, Enum):
+    complete = "complete"
+    cancel = "cancel"
+    reassign = "reassign"
+    delete = "delete"
+
+
+class TaskBulkAction(BaseModel):
+    task_ids: list[UUID] = Field(min_length=1, max_length=500)
+    operation: TaskBulkOperation
+    executor: UUID | None = None
+
+    @model_validator(mode="after")
+    def validate_executor(self) -> "TaskBulkAction":
+        if (
+            "executor" in self.model_fields_set
+            and self.operation != TaskBulkOperation.reassign
+        ):
+            raise ValueError("Поле executor используется только для reassign")
+        return self
+
+
 class TaskOut(BaseModel):
     task_id: UUID
 
 
+class TaskBatchItemOut(BaseModel):
+    index: int
+    task_id: UUID | None = None
+    detail: str | None = None
+
+
+class TaskBatchOut(BaseModel):
+    created: int
+    failed: int
+    items: list[TaskBatchItemOut]
+
+
+class TaskBulkItemOut(BaseModel):
+    task_id: UUID
+    applied: bool
+    detail: str | None = None
+
+
+class TaskBulkOut(BaseModel):
+    operation: TaskBulkOperation
+    applied: int
+    failed: int
+    items: list[TaskBulkItemOut]
+
+
 class TaskDetailsOut(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -77,20 +130,58 @@ class TaskDetailsOut(BaseModel):
     task_update_date: datetime | None = None
     task_deadline_date: datetime | None = None
     task_finish_date: datetime | None = None
+    version: int
 
 
 class TaskListOut(BaseModel):
     items: list[TaskDetailsOut]
-    total: int
+    total: int | None
+    total_capped: bool = False
     limit: int
     offset: int
+    next_cursor: str | None = None
 
 
-class TaskUserStatsOut(BaseModel):
-    completed: int
-    in_progress: int
+class TaskStatsOut(BaseModel):
+    completed: int = Field(description="Задачи, завершённые за период days")
+    in_progress: int = Field(
+        description="Открытые задачи на текущий момент, без учёта периода"
+    )
+    overdue: int = Field(
+        description="Открытые задачи с прошедшим дедлайном, без учёта периода"
+    )
+    by_status: dict[Status, int] = Field(
+        description="Все задачи по статусам за всё время, без учёта периода"
+    )
+    open_by_priority: dict[Priority, int] = Field(
+        description="Открытые задачи по приоритету, без учёта периода"
+    )
+    open_by_difficulty: dict[Difficulty, int] = Field(
+        description="Открытые задачи по сложности, без учёта периода"
+    )
+
 
+class TaskUserStatsOut(TaskStatsOut):
+    pass
 
-class TaskTeamStatsOut(BaseModel):
+
+class TaskTeamStatsOut(TaskStatsOut):
+    pass
+
+
+class TaskSeriesBucket(str, Enum):
+    day = "day"
+    week = "week"
+    month = "month"
+
+
+class TaskSeriesPointOut(BaseModel):
+    bucket_start: date
     completed: int
-    in_progress: int
+
+
+class TaskSeriesOut(BaseModel):
+    bucket: TaskSeriesBucket
+    start_date: date
+    end_date: date
+    items: list[TaskSeriesPointOut]
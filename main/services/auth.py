@@ -1,18 +1,42 @@
+import hashlib
+import logging
+import time
 from dataclasses import dataclass
 from uuid import UUID
 
 from fastapi import HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from redis.exceptions import RedisError
 from sqlalchemy.exc import IntegrityError
 
+from main.config import settings
 from main.repositories.auth import AuthRegUserRepository
-from main.schemas.auth import LogIn, RegistrationIn, Token, TokenData, UserProfileOut
+from main.schemas.auth import (
+    LogIn,
+    RegistrationIn,
+    SessionListOut,
+    Token,
+    TokenData,
+    UserProfileOut,
+)
+from main.services.cache import ExpiringLRUCache
 from main.services.jwt import JwtAuth
 from main.services.utils import Utils
 
+logger = logging.getLogger(__name__)
+
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login")
 jwt_token = JwtAuth()
 utils = Utils()
+access_token_cache = ExpiringLRUCache(maxsize=settings.AUTH_TOKEN_CACHE_SIZE)
+user_state_cache = ExpiringLRUCache(maxsize=settings.AUTH_USER_CACHE_SIZE)
+
+
+@dataclass(frozen=True)
+class UserAuthState:
+    version: int
+    active: bool
+    checked_at: float
 
 
 @dataclass
@@ -34,34 +58,100 @@ class AuthRegUserServices:
                 detail="Пользователь с таким email уже существует",
             ) from exc
 
-    async def update_token(self, refresh_token: str) -> Token:
+    async def update_token(
+        self,
+        refresh_token: str,
+        device: str | None = None,
+    ) -> Token:
         payload = jwt_token.decode_token(refresh_token, expected_type="refresh")
-        user = await self.repository.get_active_user_by_id(UUID(payload["sub"]))
-        if not user:
+        user_id = UUID(payload["sub"])
+        if not await self.repository.is_active_user(user_id):
+            self.forget_user(user_id)
             raise jwt_token._unauthorized("Пользователь неактивен")
-        return Token(**await jwt_token.rotate_refresh_token(refresh_token))
+        return Token(**await jwt_token.rotate_refresh_token(payload, device))
 
-    async def login_service(self, data: LogIn) -> Token:
+    async def login_service(self, data: LogIn, device: str | None = None) -> Token:
         user = await self.repository.get_active_user_by_email(str(data.email))
-        if not user or not await utils.verify_password(data.password, user.password):
+        valid, updated_hash = (
+            await utils.verify_and_update_password(data.password, user.password)
+            if user
+            else (False, None)
+        )
+        if not valid:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Неверный email или пароль",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        return Token(**await jwt_token.create_token_pair(str(user.user_id)))
+        if updated_hash:
+            await self.repository.update_password_hash(user.user_id, updated_hash)
+            logger.info("password_rehashed user=%s", user.user_id)
+        return Token(**await jwt_token.create_token_pair(str(user.user_id), device))
 
     async def get_current_user(self, token: str) -> TokenData:
+        user_id, token_version = self._verified_subject(token)
+        state = user_state_cache.get(user_id)
+        if (
+            state is None
+            or time.time() - state.checked_at >= settings.AUTH_USER_CACHE_TTL_SECONDS
+        ):
+            state = await self._load_user_state(user_id, state)
+        if not state.active:
+            raise jwt_token._unauthorized("Пользователь неактивен")
+        if token_version < state.version:
+            raise jwt_token._unauthorized("Токен отозван")
+        return TokenData(user_id=user_id)
+
+    async def _load_user_state(
+        self,
+        user_id: UUID,
+        cached: UserAuthState | None,
+    ) -> UserAuthState:
+        try:
+            version = await jwt_token.token_version(str(user_id))
+        except RedisError:
+            if (
+                cached is None
+                or time.time() - cached.checked_at > settings.AUTH_REDIS_GRACE_SECONDS
+            ):
+                raise
+            logger.warning("auth_stale_token_version user_id=%s", user_id)
+            return cached
+        now = time.time()
+        state = UserAuthState(
+            version=version,
+            active=await self.repository.is_active_user(user_id),
+            checked_at=now,
+        )
+        user_state_cache.set(
+            user_id,
+            state,
+            now
+            + max(
+                settings.AUTH_USER_CACHE_TTL_SECONDS,
+                settings.AUTH_REDIS_GRACE_SECONDS,
+            ),
+        )
+        return state
+
+    @staticmethod
+    def _verified_subject(token: str) -> tuple[UUID, int]:
+        digest = hashlib.sha256(token.encode()).digest()
+        cached = access_token_cache.get(digest)
+        if cached is not None:
+            return cached
+
         payload = jwt_token.decode_token(token, expected_type="access")
         try:
-            user_id = UUID(payload["sub"])
+            subject = (UUID(payload["sub"]), int(payload.get("ver", 0)))
         except (TypeError, ValueError) as exc:
             raise jwt_token._unauthorized("Некорректный субъект токена") from exc
+        access_token_cache.set(digest, subject, float(payload["exp"]))
+        return subject
 
-        user = await self.repository.get_active_user_by_id(user_id)
-        if not user:
-            raise jwt_token._unauthorized("Пользователь неактивен")
-        return TokenData(user_id=user.user_id)
+    @staticmethod
+    def forget_user(user_id: UUID) -> None:
+        user_state_cache.pop(user_id)
 
     async def get_user_profile(self, user_id: UUID) -> UserProfileOut:
         user = await self.repository.get_active_user_by_id(user_id)
@@ -71,4 +161,13 @@ class AuthRegUserServices:
 
     async def logout_service(self, refresh_token: str, user_id: UUID) -> dict[str, str]:
         await jwt_token.revoke_refresh_token(refresh_token, str(user_id))
+        self.forget_user(user_id)
         return {"detail": "Вы успешно вышли из аккаунта"}
+
+    async def logout_all_service(self, user_id: UUID) -> dict[str, str]:
+        await jwt_token.revoke_user_tokens(str(user_id))
+        self.forget_user(user_id)
+        return {"detail": "Вы вышли из аккаунта на всех устройствах"}
+
+    async def list_sessions_service(self, user_id: UUID) -> SessionListOut:
+        return SessionListOut(items=await jwt_token.list_sessions(str(user_id)))
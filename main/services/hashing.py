@@ -0,0 +1,101 @@
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from fastapi import HTTPException, status
+
+from main.config import settings
+from main.metrics import DurationStats
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PasswordHashPool:
+    workers: int
+    queue_size: int
+    pending: int = 0
+    rejected: int = 0
+    wait: DurationStats = field(default_factory=DurationStats)
+    duration: DurationStats = field(default_factory=DurationStats)
+    _executor: ThreadPoolExecutor = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers,
+            thread_name_prefix="password-hash",
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return max(self.pending - self.workers, 0)
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        if self.pending >= self.workers + self.queue_size:
+            self.rejected += 1
+            logger.warning(
+                "password_hash_rejected pending=%s queue_size=%s",
+                self.pending,
+                self.queue_size,
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Сервис авторизации перегружен, повторите позже",
+                headers={"Retry-After": "1"},
+            )
+
+        loop = asyncio.get_running_loop()
+        submitted_at = time.perf_counter()
+
+        timings: list[float] = []
+
+        def job() -> Any:
+            started_at = time.perf_counter()
+            timings.append(started_at - submitted_at)
+            try:
+                return func(*args)
+            finally:
+                timings.append(time.perf_counter() - started_at)
+
+        self.pending += 1
+        future = self._executor.submit(job)
+        future.add_done_callback(lambda _: self._release_from(loop, timings))
+        return await asyncio.wrap_future(future)
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "in_flight": min(self.pending, self.workers),
+            "queue_depth": self.queue_depth,
+            "rejected": self.rejected,
+            "wait": self.wait.snapshot(),
+            "hash_duration": self.duration.snapshot(),
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release_from(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        timings: list[float],
+    ) -> None:
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(self._release, timings)
+
+    def _release(self, timings: list[float]) -> None:
+        self.pending -= 1
+        if len(timings) == 2:
+            self.wait.observe(timings[0])
+            self.duration.observe(timings[1])
+
+
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    queue_size=settings.PASSWORD_HASH_QUEUE_SIZE,
+)
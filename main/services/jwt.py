@@ -1,3 +1,5 @@
+import json
+import time
 from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from uuid import uuid4
@@ -6,7 +8,67 @@ import jwt
 from fastapi import HTTPException, status
 
 from main.config import settings
-from main.redis import redis_client
+from main.redis import redis_breaker, redis_client
+
+INDEX_SESSION = """
+local function index_session(sessions_key, devices_key, jti, now, ttl, info)
+    local expired = redis.call("ZRANGEBYSCORE", sessions_key, "-inf", now)
+    if #expired > 0 then
+        redis.call("ZREM", sessions_key, unpack(expired))
+        redis.call("HDEL", devices_key, unpack(expired))
+    end
+    redis.call("ZADD", sessions_key, now + ttl, jti)
+    redis.call("HSET", devices_key, jti, info)
+    redis.call("EXPIRE", sessions_key, ttl)
+    redis.call("EXPIRE", devices_key, ttl)
+end
+"""
+
+ISSUE_SCRIPT = (
+    INDEX_SESSION
+    + """
+redis.call("SET", KEYS[1], ARGV[1], "EX", ARGV[2])
+index_session(KEYS[3], KEYS[4], ARGV[3], tonumber(ARGV[4]), tonumber(ARGV[2]), ARGV[5])
+return tonumber(redis.call("GET", KEYS[2])) or 0
+"""
+)
+
+ROTATE_SCRIPT = (
+    INDEX_SESSION
+    + """
+local stored_user_id = redis.call("GETDEL", KEYS[1])
+redis.call("ZREM", KEYS[4], ARGV[7])
+redis.call("HDEL", KEYS[5], ARGV[7])
+local version = tonumber(redis.call("GET", KEYS[3])) or 0
+if stored_user_id ~= ARGV[1] or tonumber(ARGV[6]) < version then
+    return -1
+end
+redis.call("SET", KEYS[2], ARGV[1], "EX", ARGV[2])
+index_session(KEYS[4], KEYS[5], ARGV[3], tonumber(ARGV[4]), tonumber(ARGV[2]), ARGV[5])
+return version
+"""
+)
+
+REVOKE_SCRIPT = """
+local deleted = redis.call("DEL", KEYS[1])
+redis.call("ZREM", KEYS[2], ARGV[1])
+redis.call("HDEL", KEYS[3], ARGV[1])
+return deleted
+"""
+
+REVOKE_ALL_SCRIPT = """
+local sessions = redis.call("ZRANGE", KEYS[2], 0, -1)
+for _, jti in ipairs(sessions) do
+    redis.call("DEL", ARGV[1] .. jti)
+end
+redis.call("DEL", KEYS[2], KEYS[3])
+return redis.call("INCR", KEYS[1])
+"""
+
+issue_script = redis_client.register_script(ISSUE_SCRIPT)
+rotate_script = redis_client.register_script(ROTATE_SCRIPT)
+revoke_script = redis_client.register_script(REVOKE_SCRIPT)
+revoke_all_script = redis_client.register_script(REVOKE_ALL_SCRIPT)
 
 
 @dataclass
@@ -24,46 +86,83 @@ class JwtAuth:
     def refresh_lifetime(self) -> timedelta:
         return timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
 
-    async def create_token_pair(self, user_id: str) -> dict[str, str]:
-        access_token = self._create_token(
+    @property
+    def _refresh_ttl_seconds(self) -> int:
+        return int(self.refresh_lifetime.total_seconds())
+
+    async def create_token_pair(
+        self,
+        user_id: str,
+        device: str | None = None,
+    ) -> dict[str, str]:
+        refresh_jti = str(uuid4())
+        now = int(time.time())
+        version = await redis_breaker.call(
+            issue_script,
+            keys=[
+                self._refresh_key(refresh_jti),
+                self._version_key(user_id),
+                self._sessions_key(user_id),
+                self._devices_key(user_id),
+            ],
+            args=[
+                user_id,
+                self._refresh_ttl_seconds,
+                refresh_jti,
+                now,
+                self._session_info(device, now),
+            ],
+        )
+        return self._sign_pair(user_id, int(version), refresh_jti)
+
+    def _sign_pair(
+        self, user_id: str, version: int, refresh_jti: str
+    ) -> dict[str, str]:
+        now = datetime.now(UTC)
+        access_claims = self._build_claims(
             user_id=user_id,
             token_type="access",
+            issued_at=now,
             lifetime=self.access_lifetime,
+            version=version,
+            jti=str(uuid4()),
         )
-        refresh_token = self._create_token(
+        refresh_claims = self._build_claims(
             user_id=user_id,
             token_type="refresh",
+            issued_at=now,
             lifetime=self.refresh_lifetime,
-        )
-        refresh_payload = self.decode_token(refresh_token, expected_type="refresh")
-        await redis_client.setex(
-            self._refresh_key(refresh_payload["jti"]),
-            self.refresh_lifetime,
-            user_id,
+            version=version,
+            jti=refresh_jti,
         )
         return {
-            "access_token": access_token,
-            "refresh_token": refresh_token,
+            "access_token": self._sign(access_claims),
+            "refresh_token": self._sign(refresh_claims),
             "token_type": "bearer",
         }
 
-    def _create_token(
+    def _build_claims(
         self,
         user_id: str,
         token_type: str,
+        issued_at: datetime,
         lifetime: timedelta,
-    ) -> str:
-        now = datetime.now(UTC)
-        payload = {
+        version: int,
+        jti: str,
+    ) -> dict:
+        return {
             "sub": user_id,
             "typ": token_type,
-            "jti": str(uuid4()),
-            "iat": now,
-            "exp": now + lifetime,
+            "ver": version,
+            "jti": jti,
+            "iat": issued_at,
+            "exp": issued_at + lifetime,
             "iss": self.ISSUER,
             "aud": self.AUDIENCE,
         }
-        return jwt.encode(payload, self.SECRET_KEY, algorithm=self.ALGORITHM)
+
+    def _sign(self, claims: dict) -> str:
+        return jwt.encode(claims, self.SECRET_KEY, algorithm=self.ALGORITHM)
 
     def decode_token(self, token: str, expected_type: str) -> dict:
         try:
@@ -84,13 +183,38 @@ class JwtAuth:
             raise self._unauthorized("Некорректный тип токена")
         return payload
 
-    async def rotate_refresh_token(self, refresh_token: str) -> dict[str, str]:
-        payload = self.decode_token(refresh_token, expected_type="refresh")
-        key = self._refresh_key(payload["jti"])
-        stored_user_id = await redis_client.getdel(key)
-        if not stored_user_id or stored_user_id != payload["sub"]:
+    async def rotate_refresh_token(
+        self,
+        payload: dict,
+        device: str | None = None,
+    ) -> dict[str, str]:
+        user_id = payload["sub"]
+        refresh_jti = str(uuid4())
+        now = int(time.time())
+        version = int(
+            await redis_breaker.call(
+                rotate_script,
+                keys=[
+                    self._refresh_key(payload["jti"]),
+                    self._refresh_key(refresh_jti),
+                    self._version_key(user_id),
+                    self._sessions_key(user_id),
+                    self._devices_key(user_id),
+                ],
+                args=[
+                    user_id,
+                    self._refresh_ttl_seconds,
+                    refresh_jti,
+                    now,
+                    self._session_info(device, now),
+                    int(payload.get("ver", 0)),
+                    payload["jti"],
+                ],
+            )
+        )
+        if version < 0:
             raise self._unauthorized("Refresh token отозван или уже использован")
-        return await self.create_token_pair(stored_user_id)
+        return self._sign_pair(user_id, version, refresh_jti)
 
     async def revoke_refresh_token(
         self,
@@ -100,14 +224,88 @@ class JwtAuth:
         payload = self.decode_token(refresh_token, expected_type="refresh")
         if payload["sub"] != expected_user_id:
             raise self._unauthorized("Токен принадлежит другому пользователю")
-        deleted = await redis_client.delete(self._refresh_key(payload["jti"]))
+        deleted = await redis_breaker.call(
+            revoke_script,
+            keys=[
+                self._refresh_key(payload["jti"]),
+                self._sessions_key(expected_user_id),
+                self._devices_key(expected_user_id),
+            ],
+            args=[payload["jti"]],
+        )
         if not deleted:
             raise self._unauthorized("Refresh token уже отозван")
 
+    async def token_version(self, user_id: str) -> int:
+        version = await redis_breaker.call(
+            redis_client.get,
+            self._version_key(user_id),
+        )
+        return int(version or 0)
+
+    async def revoke_user_tokens(self, user_id: str) -> int:
+        version = await redis_breaker.call(
+            revoke_all_script,
+            keys=[
+                self._version_key(user_id),
+                self._sessions_key(user_id),
+                self._devices_key(user_id),
+            ],
+            args=[self._refresh_key("")],
+        )
+        return int(version)
+
+    async def list_sessions(self, user_id: str) -> list[dict]:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.zrangebyscore(
+                self._sessions_key(user_id),
+                int(time.time()),
+                "+inf",
+                withscores=True,
+            )
+            pipe.hgetall(self._devices_key(user_id))
+            sessions, devices = await redis_breaker.call(pipe.execute)
+
+        items = []
+        for jti, expires_at in sessions:
+            info = json.loads(devices.get(jti) or "{}")
+            items.append(
+                {
+                    "session_id": jti,
+                    "device": info.get("device"),
+                    "issued_at": datetime.fromtimestamp(
+                        info.get("issued_at", expires_at - self._refresh_ttl_seconds),
+                        UTC,
+                    ),
+                    "expires_at": datetime.fromtimestamp(expires_at, UTC),
+                }
+            )
+        items.sort(key=lambda item: item["issued_at"], reverse=True)
+        return items
+
+    @staticmethod
+    def _session_info(device: str | None, issued_at: int) -> str:
+        return json.dumps(
+            {"device": device[:200] if device else None, "issued_at": issued_at},
+            ensure_ascii=False,
+        )
+
     @staticmethod
     def _refresh_key(jti: str) -> str:
         return f"auth:refresh:{jti}"
 
+    @staticmethod
+    def _sessions_key(user_id: str) -> str:
+        return f"auth:sessions:{user_id}"
+
+    @staticmethod
+    def _devices_key(user_id: str) -> str:
+        return f"auth:session-devices:{user_id}"
+
+    @staticmethod
+    def _version_key(user_id: str) -> str:
+        return f"auth:token-version:{user_id}"
+
     @staticmethod
     def _unauthorized(detail: str) -> HTTPException:
         return HTTPException(
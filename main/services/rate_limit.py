@@ -1,29 +1,123 @@
+import logging
+import math
+import time
+from dataclasses import dataclass
+
 from fastapi import HTTPException, status
 from redis.exceptions import RedisError
 
-from main.redis import redis_client
+from main.config import settings
+from main.redis import CircuitOpenError, redis_breaker, redis_client
+from main.services.cache import ExpiringLRUCache
 
+logger = logging.getLogger(__name__)
 
-async def enforce_rate_limit(
-    identity: str,
-    action: str,
-    limit: int,
-    window_seconds: int,
-) -> None:
-    key = f"rate:{action}:{identity}"
+# GCRA over every key at once: either all limits admit the request and their
+# theoretical arrival times advance, or nothing is written and the longest
+# wait in milliseconds is returned.
+GCRA_SCRIPT = """
+local now_parts = redis.call("TIME")
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local retry_after = 0
+local arrivals = {}
+for index, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[index * 2 - 1])
+    local period = tonumber(ARGV[index * 2])
+    local interval = math.ceil(period / limit)
+    local tat = tonumber(redis.call("GET", key)) or now
+    if tat < now then
+        tat = now
+    end
+    local arrival = tat + interval
+    local allowed_at = arrival - period
+    if allowed_at > now then
+        retry_after = math.max(retry_after, allowed_at - now)
+    end
+    arrivals[index] = arrival
+end
+if retry_after > 0 then
+    return retry_after
+end
+for index, key in ipairs(KEYS) do
+    redis.call("SET", key, arrivals[index], "PX", arrivals[index] - now)
+end
+return 0
+"""
+
+gcra_script = redis_client.register_script(GCRA_SCRIPT)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    action: str
+    identity: str
+    limit: int
+    window_seconds: int
+
+    @property
+    def key(self) -> str:
+        return f"rate:{self.action}:{self.identity}"
+
+
+@dataclass
+class LocalTokenBuckets:
+    buckets: ExpiringLRUCache
+
+    def acquire(self, limits: tuple[RateLimit, ...]) -> int:
+        now = time.time()
+        refilled = []
+        retry_after_ms = 0
+        for item in limits:
+            tokens, updated_at = self.buckets.get(item.key) or (item.limit, now)
+            rate = item.limit / item.window_seconds
+            tokens = min(item.limit, tokens + (now - updated_at) * rate)
+            if tokens < 1:
+                retry_after_ms = max(
+                    retry_after_ms,
+                    math.ceil((1 - tokens) / rate * 1000),
+                )
+            refilled.append(tokens)
+        for item, tokens in zip(limits, refilled, strict=True):
+            if not retry_after_ms:
+                tokens -= 1
+            self.buckets.set(item.key, (tokens, now), now + item.window_seconds)
+        return retry_after_ms
+
+
+local_buckets = LocalTokenBuckets(
+    ExpiringLRUCache(maxsize=settings.RATE_LIMIT_FALLBACK_KEYS)
+)
+
+
+async def enforce_rate_limits(*limits: RateLimit) -> None:
+    args: list[int] = []
+    for item in limits:
+        args.extend((item.limit, item.window_seconds * 1000))
     try:
-        current = await redis_client.incr(key)
-        if current == 1:
-            await redis_client.expire(key, window_seconds)
+        retry_after_ms = int(
+            await redis_breaker.call(
+                gcra_script,
+                keys=[item.key for item in limits],
+                args=args,
+            )
+        )
     except RedisError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            detail="Сервис авторизации временно недоступен",
-        ) from exc
+        if not isinstance(exc, CircuitOpenError):
+            logger.warning("rate_limit_local_fallback error=%s", exc.__class__.__name__)
+        retry_after_ms = local_buckets.acquire(limits)
 
-    if current > limit:
+    if retry_after_ms > 0:
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Слишком много запросов, повторите позже",
-            headers={"Retry-After": str(window_seconds)},
+            headers={"Retry-After": str(math.ceil(retry_after_ms / 1000))},
         )
+
+
+async def enforce_rate_limit(
+    identity: str,
+    action: str,
+    limit: int,
+    window_seconds: int,
+) -> None:
+    await enforce_rate_limits(RateLimit(action, identity, limit, window_seconds))
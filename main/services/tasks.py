@@ -1,15 +1,31 @@
+import base64
+import binascii
 import logging
+from collections.abc import Collection, Iterator
 from dataclasses import dataclass
-from datetime import UTC, datetime, timedelta
+from datetime import UTC, date, datetime, timedelta
+from typing import NoReturn
 from uuid import UUID
 
 from fastapi import HTTPException
+from sqlalchemy import Row
 
 from main.db.models.tasks import Status, Task
-from main.repositories.tasks import TaskRepository
+from main.repositories.tasks import TaskRepository, TaskSortKey, TeamAccess
 from main.schemas.tasks import (
+    TaskBatchCreate,
+    TaskBatchItemOut,
+    TaskBatchOut,
+    TaskBulkAction,
+    TaskBulkItemOut,
+    TaskBulkOperation,
+    TaskBulkOut,
     TaskCreate,
+    TaskDetailsOut,
     TaskListOut,
+    TaskSeriesBucket,
+    TaskSeriesOut,
+    TaskSeriesPointOut,
     TaskTeamStatsOut,
     TaskUpdate,
     TaskUserStatsOut,
@@ -27,25 +43,21 @@ class TaskServices:
         data: TaskCreate,
         team_id: UUID,
         author_id: UUID,
-    ) -> UUID:
-        if not await self.repository.check_team_exists(team_id):
-            raise HTTPException(status_code=404, detail="Команда не найдена")
-        if not await self.repository.check_user_is_chief(author_id, team_id):
+    ) -> TaskDetailsOut:
+        access = await self._get_team_access(team_id, author_id, data.executor)
+        if not access.is_chief(author_id):
             raise HTTPException(
                 status_code=403,
                 detail="Требуются права руководителя команды",
             )
-        if data.executor and not await self.repository.check_user_in_team(
-            data.executor,
-            team_id,
-        ):
+        if data.executor and not access.is_member(data.executor):
             raise HTTPException(
                 status_code=400,
                 detail="Исполнитель не состоит в команде",
             )
         self._validate_deadline(data.task_deadline_date)
         task_status = Status.assigned if data.executor else Status.unassigned
-        task_id = await self.repository.create_task(
+        task = await self.repository.create_task(
             data,
             team_id,
             author_id,
@@ -53,18 +65,72 @@ class TaskServices:
             datetime.now(UTC),
         )
         logger.info(
-            "task_created actor=%s task=%s team=%s", author_id, task_id, team_id
+            "task_created actor=%s task=%s team=%s", author_id, task.task_id, team_id
         )
-        return task_id
+        return TaskDetailsOut.model_validate(task)
+
+    async def create_tasks(
+        self,
+        data: TaskBatchCreate,
+        team_id: UUID,
+        author_id: UUID,
+    ) -> TaskBatchOut:
+        executors = {item.executor for item in data.items if item.executor}
+        access = await self._get_team_access(team_id, author_id, *executors)
+        if not access.is_chief(author_id):
+            raise HTTPException(
+                status_code=403,
+                detail="Требуются права руководителя команды",
+            )
+
+        now = datetime.now(UTC)
+        errors: dict[int, str] = {}
+        for index, item in enumerate(data.items):
+            if item.executor and not access.is_member(item.executor):
+                errors[index] = "Исполнитель не состоит в команде"
+            elif item.task_deadline_date and item.task_deadline_date <= now:
+                errors[index] = "Дедлайн должен быть позже текущего времени"
+        if errors and (data.atomic or len(errors) == len(data.items)):
+            raise HTTPException(
+                status_code=400,
+                detail=[
+                    {"index": index, "detail": detail}
+                    for index, detail in errors.items()
+                ],
+            )
+
+        valid = [item for index, item in enumerate(data.items) if index not in errors]
+        created: list[UUID] = []
+        if valid:
+            created = await self.repository.create_tasks(valid, team_id, author_id, now)
+        task_ids = iter(created)
+        items = [
+            (
+                TaskBatchItemOut(index=index, detail=errors[index])
+                if index in errors
+                else TaskBatchItemOut(index=index, task_id=next(task_ids))
+            )
+            for index in range(len(data.items))
+        ]
+        logger.info(
+            "tasks_batch_created actor=%s team=%s created=%s failed=%s",
+            author_id,
+            team_id,
+            len(created),
+            len(errors),
+        )
+        return TaskBatchOut(created=len(created), failed=len(errors), items=items)
 
     async def update_task(
         self,
         data: TaskUpdate,
         task_id: UUID,
         actor_id: UUID,
-    ) -> UUID:
-        task = await self._get_task(task_id)
-        await self._require_task_editor(task, actor_id)
+        versions: Collection[int] | None = None,
+    ) -> TaskDetailsOut:
+        task, access = await self._get_task_access(task_id, actor_id, data.executor)
+        self._require_task_editor(task, access, actor_id)
+        self._require_version(task, versions)
         if task.status in (Status.completed, Status.canceled):
             raise HTTPException(
                 status_code=409,
@@ -77,7 +143,7 @@ class TaskServices:
 
         executor = updates.get("executor", task.executor)
         if "executor" in updates and executor is not None:
-            if not await self.repository.check_user_in_team(executor, task.team_id):
+            if not access.is_member(executor):
                 raise HTTPException(
                     status_code=400,
                     detail="Исполнитель не состоит в команде",
@@ -101,19 +167,26 @@ class TaskServices:
             updates["task_finish_date"] = datetime.now(UTC)
 
         if not updates:
-            return task_id
-        updated_id = await self.repository.update_task(
+            return TaskDetailsOut.model_validate(task)
+        updated = await self.repository.update_task(
             task,
             updates,
             actor_id,
             datetime.now(UTC),
         )
-        logger.info("task_updated actor=%s task=%s", actor_id, task_id)
-        return updated_id
+        if updated is None:
+            self._raise_conflict(versions)
+        logger.info(
+            "task_updated actor=%s task=%s version=%s",
+            actor_id,
+            task_id,
+            updated.version,
+        )
+        return TaskDetailsOut.model_validate(updated)
 
     async def delete_task(self, task_id: UUID, actor_id: UUID) -> None:
-        task = await self._get_task(task_id)
-        await self._require_task_editor(task, actor_id)
+        task, access = await self._get_task_access(task_id, actor_id)
+        self._require_task_editor(task, access, actor_id)
         deleted = await self.repository.soft_delete_task(
             task_id,
             actor_id,
@@ -123,14 +196,30 @@ class TaskServices:
             raise HTTPException(status_code=409, detail="Задача уже удалена")
         logger.info("task_deleted actor=%s task=%s", actor_id, task_id)
 
-    async def complete_task(self, task_id: UUID, actor_id: UUID) -> None:
-        task = await self._get_task(task_id)
-        await self._require_team_member(actor_id, task.team_id)
-        is_chief = await self.repository.check_user_is_chief(
+    async def complete_task(
+        self,
+        task_id: UUID,
+        actor_id: UUID,
+        versions: Collection[int] | None = None,
+    ) -> TaskDetailsOut:
+        completed = await self.repository.complete_task(
+            task_id,
             actor_id,
-            task.team_id,
+            datetime.now(UTC),
+            versions,
         )
-        if task.executor != actor_id and not is_chief:
+        if completed is not None:
+            logger.info(
+                "task_completed actor=%s task=%s version=%s",
+                actor_id,
+                task_id,
+                completed.version,
+            )
+            return TaskDetailsOut.model_validate(completed)
+
+        task, access = await self._get_task_access(task_id, actor_id)
+        self._require_team_member(access, actor_id)
+        if task.executor != actor_id and not access.is_chief(actor_id):
             raise HTTPException(
                 status_code=403,
                 detail="Завершить задачу может исполнитель или руководитель",
@@ -142,13 +231,88 @@ class TaskServices:
             )
         if task.status in (Status.completed, Status.canceled):
             raise HTTPException(status_code=409, detail="Задача уже закрыта")
-        if not await self.repository.complete_task(
-            task_id,
+        self._require_version(task, versions)
+        raise HTTPException(status_code=409, detail="Состояние задачи изменилось")
+
+    async def apply_bulk_action(
+        self,
+        data: TaskBulkAction,
+        team_id: UUID,
+        actor_id: UUID,
+    ) -> TaskBulkOut:
+        reassign = data.operation == TaskBulkOperation.reassign
+        access = await self._get_team_access(
+            team_id,
             actor_id,
-            datetime.now(UTC),
-        ):
-            raise HTTPException(status_code=409, detail="Состояние задачи изменилось")
-        logger.info("task_completed actor=%s task=%s", actor_id, task_id)
+            data.executor if reassign else None,
+        )
+        self._require_team_member(access, actor_id)
+        if reassign and data.executor and not access.is_member(data.executor):
+            raise HTTPException(
+                status_code=400,
+                detail="Исполнитель не состоит в команде",
+            )
+
+        task_ids = list(dict.fromkeys(data.task_ids))
+        states = await self.repository.get_task_states(team_id, task_ids)
+        errors: dict[UUID, str] = {}
+        for task_id in task_ids:
+            error = self._bulk_error(
+                data.operation,
+                states.get(task_id),
+                access,
+                actor_id,
+            )
+            if error:
+                errors[task_id] = error
+
+        allowed = [task_id for task_id in task_ids if task_id not in errors]
+        applied: set[UUID] = set()
+        if allowed:
+            now = datetime.now(UTC)
+            if data.operation == TaskBulkOperation.complete:
+                changed = await self.repository.complete_tasks(allowed, actor_id, now)
+            elif data.operation == TaskBulkOperation.cancel:
+                changed = await self.repository.cancel_tasks(allowed, actor_id, now)
+            elif reassign:
+                changed = await self.repository.reassign_tasks(
+                    allowed, data.executor, actor_id, now
+                )
+            else:
+                changed = await self.repository.soft_delete_tasks(
+                    allowed, actor_id, now
+                )
+            applied.update(changed)
+        for task_id in allowed:
+            if task_id not in applied:
+                errors[task_id] = "Состояние задачи изменилось"
+
+        logger.info(
+            "tasks_bulk_applied actor=%s team=%s operation=%s applied=%s failed=%s",
+            actor_id,
+            team_id,
+            data.operation.value,
+            len(applied),
+            len(errors),
+        )
+        return TaskBulkOut(
+            operation=data.operation,
+            applied=len(applied),
+            failed=len(errors),
+            items=[
+                TaskBulkItemOut(
+                    task_id=task_id,
+                    applied=task_id in applied,
+                    detail=errors.get(task_id),
+                )
+                for task_id in task_ids
+            ],
+        )
+
+    async def get_task(self, task_id: UUID, inspector_id: UUID) -> Task:
+        task, access = await self._get_task_access(task_id, inspector_id)
+        self._require_team_member(access, inspector_id)
+        return task
 
     async def get_team_tasks(
         self,
@@ -158,18 +322,26 @@ class TaskServices:
         days: int,
         limit: int,
         offset: int,
+        cursor: str | None,
+        include_total: bool,
+        total_cap: int | None,
     ) -> TaskListOut:
-        await self._require_team_member(inspector_id, team_id)
+        after = self._decode_cursor(cursor, offset)
+        access = await self._get_team_access(team_id, inspector_id)
+        self._require_team_member(access, inspector_id)
         start_date, end_date = self._period(days)
         items, total = await self.repository.get_team_tasks(
             team_id,
             task_status,
             start_date,
             end_date,
-            limit,
+            limit + 1,
             offset,
+            after,
+            include_total,
+            total_cap,
         )
-        return TaskListOut(items=items, total=total, limit=limit, offset=offset)
+        return self._task_page(items, total, total_cap, limit, offset)
 
     async def get_user_tasks(
         self,
@@ -180,12 +352,14 @@ class TaskServices:
         days: int,
         limit: int,
         offset: int,
+        cursor: str | None,
+        include_total: bool,
+        total_cap: int | None,
     ) -> TaskListOut:
-        await self._require_team_member(user_id, team_id)
-        if user_id != inspector_id and not await self.repository.check_user_is_chief(
-            inspector_id,
-            team_id,
-        ):
+        after = self._decode_cursor(cursor, offset)
+        access = await self._get_team_access(team_id, user_id, inspector_id)
+        self._require_team_member(access, user_id)
+        if user_id != inspector_id and not access.is_chief(inspector_id):
             raise HTTPException(
                 status_code=403,
                 detail="Недостаточно прав для просмотра задач пользователя",
@@ -197,10 +371,13 @@ class TaskServices:
             task_status,
             start_date,
             end_date,
-            limit,
+            limit + 1,
             offset,
+            after,
+            include_total,
+            total_cap,
         )
-        return TaskListOut(items=items, total=total, limit=limit, offset=offset)
+        return self._task_page(items, total, total_cap, limit, offset)
 
     async def get_user_task_statistics(
         self,
@@ -209,27 +386,22 @@ class TaskServices:
         inspector_id: UUID,
         days: int,
     ) -> TaskUserStatsOut:
-        await self._require_team_member(user_id, team_id)
-        if inspector_id != user_id and not await self.repository.check_user_is_chief(
-            inspector_id,
-            team_id,
-        ):
+        access = await self._get_team_access(team_id, user_id, inspector_id)
+        self._require_team_member(access, user_id)
+        if inspector_id != user_id and not access.is_chief(inspector_id):
             raise HTTPException(
                 status_code=403,
                 detail="Недостаточно прав для просмотра статистики пользователя",
             )
         start_date, end_date = self._period(days)
         return TaskUserStatsOut(
-            completed=await self.repository.count_user_completed_tasks(
+            **await self.repository.get_task_statistics(
                 team_id,
                 user_id,
                 start_date,
                 end_date,
-            ),
-            in_progress=await self.repository.count_user_in_progress_tasks(
-                team_id,
-                user_id,
-            ),
+                datetime.now(UTC),
+            )
         )
 
     async def get_team_task_statistics(
@@ -238,39 +410,135 @@ class TaskServices:
         inspector_id: UUID,
         days: int,
     ) -> TaskTeamStatsOut:
-        await self._require_team_member(inspector_id, team_id)
+        access = await self._get_team_access(team_id, inspector_id)
+        self._require_team_member(access, inspector_id)
         start_date, end_date = self._period(days)
         return TaskTeamStatsOut(
-            completed=await self.repository.count_team_completed_tasks(
+            **await self.repository.get_task_statistics(
                 team_id,
+                None,
                 start_date,
                 end_date,
-            ),
-            in_progress=await self.repository.count_team_in_progress_tasks(team_id),
+                datetime.now(UTC),
+            )
+        )
+
+    async def get_completion_series(
+        self,
+        team_id: UUID,
+        inspector_id: UUID,
+        user_id: UUID | None,
+        bucket: TaskSeriesBucket,
+        days: int,
+    ) -> TaskSeriesOut:
+        access = await self._get_team_access(team_id, user_id, inspector_id)
+        self._require_team_member(access, inspector_id)
+        if user_id is not None:
+            self._require_team_member(access, user_id)
+        if user_id not in (None, inspector_id) and not access.is_chief(inspector_id):
+            raise HTTPException(
+                status_code=403,
+                detail="Недостаточно прав для просмотра статистики пользователя",
+            )
+        self._period(days)
+        end_day = datetime.now(UTC).date()
+        start_day = self._bucket_start(bucket, end_day - timedelta(days=days - 1))
+        totals = await self.repository.get_completion_series(
+            team_id,
+            user_id,
+            bucket,
+            start_day,
+            end_day,
+        )
+        return TaskSeriesOut(
+            bucket=bucket,
+            start_date=start_day,
+            end_date=end_day,
+            items=[
+                TaskSeriesPointOut(bucket_start=day, completed=totals.get(day, 0))
+                for day in self._bucket_starts(bucket, start_day, end_day)
+            ],
         )
 
-    async def _get_task(self, task_id: UUID) -> Task:
-        task = await self.repository.get_task(task_id)
-        if not task:
+    async def _get_team_access(
+        self,
+        team_id: UUID,
+        *user_ids: UUID | None,
+    ) -> TeamAccess:
+        access = await self.repository.get_team_access(
+            team_id,
+            {user_id for user_id in user_ids if user_id is not None},
+        )
+        if access is None:
+            raise HTTPException(status_code=404, detail="Команда не найдена")
+        return access
+
+    async def _get_task_access(
+        self,
+        task_id: UUID,
+        *user_ids: UUID | None,
+    ) -> tuple[Task, TeamAccess]:
+        found = await self.repository.get_task_access(
+            task_id,
+            {user_id for user_id in user_ids if user_id is not None},
+        )
+        if found is None:
             raise HTTPException(status_code=404, detail="Задача не найдена")
-        return task
+        return found
 
-    async def _require_task_editor(self, task: Task, actor_id: UUID) -> None:
-        if not await self.repository.check_user_in_team(actor_id, task.team_id):
-            raise HTTPException(status_code=403, detail="Нет доступа к команде")
-        if task.author != actor_id and not await self.repository.check_user_is_chief(
-            actor_id,
-            task.team_id,
-        ):
+    @staticmethod
+    def _require_task_editor(task: Task, access: TeamAccess, actor_id: UUID) -> None:
+        TaskServices._require_team_member(access, actor_id)
+        if task.author != actor_id and not access.is_chief(actor_id):
             raise HTTPException(
                 status_code=403,
                 detail="Редактировать задачу может автор или руководитель",
             )
 
-    async def _require_team_member(self, user_id: UUID, team_id: UUID) -> None:
-        if not await self.repository.check_team_exists(team_id):
-            raise HTTPException(status_code=404, detail="Команда не найдена")
-        if not await self.repository.check_user_in_team(user_id, team_id):
+    @staticmethod
+    def _bulk_error(
+        operation: TaskBulkOperation,
+        state: Row | None,
+        access: TeamAccess,
+        actor_id: UUID,
+    ) -> str | None:
+        if state is None:
+            return "Задача не найдена"
+        closed = state.status in (Status.completed, Status.canceled)
+        if operation == TaskBulkOperation.complete:
+            if state.executor != actor_id and not access.is_chief(actor_id):
+                return "Завершить задачу может исполнитель или руководитель"
+            if state.executor is None:
+                return "Нельзя завершить задачу без исполнителя"
+            if closed:
+                return "Задача уже закрыта"
+            return None
+        if state.author != actor_id and not access.is_chief(actor_id):
+            return "Редактировать задачу может автор или руководитель"
+        if closed and operation != TaskBulkOperation.delete:
+            return "Завершённую или отменённую задачу нельзя редактировать"
+        return None
+
+    @staticmethod
+    def _require_version(task: Task, versions: Collection[int] | None) -> None:
+        if versions is not None and task.version not in versions:
+            raise HTTPException(
+                status_code=412,
+                detail="Задача была изменена, обновите данные",
+            )
+
+    @staticmethod
+    def _raise_conflict(versions: Collection[int] | None) -> NoReturn:
+        if versions is not None:
+            raise HTTPException(
+                status_code=412,
+                detail="Задача была изменена, обновите данные",
+            )
+        raise HTTPException(status_code=409, detail="Состояние задачи изменилось")
+
+    @staticmethod
+    def _require_team_member(access: TeamAccess, user_id: UUID) -> None:
+        if not access.is_member(user_id):
             raise HTTPException(status_code=403, detail="Нет доступа к команде")
 
     @staticmethod
@@ -283,6 +551,82 @@ class TaskServices:
         end_date = datetime.now(UTC)
         return end_date - timedelta(days=days), end_date
 
+    @staticmethod
+    def _bucket_start(bucket: TaskSeriesBucket, day: date) -> date:
+        if bucket == TaskSeriesBucket.week:
+            return day - timedelta(days=day.weekday())
+        if bucket == TaskSeriesBucket.month:
+            return day.replace(day=1)
+        return day
+
+    @staticmethod
+    def _bucket_starts(
+        bucket: TaskSeriesBucket,
+        start_day: date,
+        end_day: date,
+    ) -> Iterator[date]:
+        current = TaskServices._bucket_start(bucket, start_day)
+        while current <= end_day:
+            yield current
+            if bucket == TaskSeriesBucket.week:
+                current += timedelta(days=7)
+            elif bucket == TaskSeriesBucket.month:
+                current = (current.replace(day=28) + timedelta(days=4)).replace(day=1)
+            else:
+                current += timedelta(days=1)
+
+    @staticmethod
+    def _task_page(
+        items: list[Task],
+        total: int | None,
+        total_cap: int | None,
+        limit: int,
+        offset: int,
+    ) -> TaskListOut:
+        total_capped = total is not None and total_cap is not None and total > total_cap
+        if total_capped:
+            total = total_cap
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = TaskServices._encode_cursor(
+                (last.task_create_date, last.task_id)
+            )
+        return TaskListOut(
+            items=items,
+            total=total,
+            total_capped=total_capped,
+            limit=limit,
+            offset=offset,
+            next_cursor=next_cursor,
+        )
+
+    @staticmethod
+    def _encode_cursor(sort_key: TaskSortKey) -> str:
+        created_at, task_id = sort_key
+        raw = f"{created_at.isoformat()}|{task_id}".encode()
+        return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str | None, offset: int) -> TaskSortKey | None:
+        if cursor is None:
+            return None
+        if offset:
+            raise HTTPException(
+                status_code=400,
+                detail="Параметры cursor и offset нельзя использовать вместе",
+            )
+        try:
+            raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            created_at, task_id = raw.decode().split("|")
+            sort_key = datetime.fromisoformat(created_at), UUID(task_id)
+        except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+            raise HTTPException(status_code=400, detail="Некорректный курсор") from exc
+        if sort_key[0].tzinfo is None:
+            raise HTTPException(status_code=400, detail="Некорректный курсор")
+        return sort_key
+
     @staticmethod
     def _validate_deadline(deadline: datetime | None) -> None:
         if deadline is not None and deadline <= datetime.now(UTC):
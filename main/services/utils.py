@@ -1,19 +1,41 @@
-import asyncio
 from dataclasses import dataclass
 
 from pwdlib import PasswordHash
+from pwdlib.hashers.argon2 import Argon2Hasher
+
+from main.config import settings
+from main.services.hashing import password_hash_pool
 
 
 @dataclass
 class Utils:
-    password_hash = PasswordHash.recommended()
+    password_hash = PasswordHash(
+        (
+            Argon2Hasher(
+                time_cost=settings.PASSWORD_HASH_TIME_COST,
+                memory_cost=settings.PASSWORD_HASH_MEMORY_COST,
+                parallelism=settings.PASSWORD_HASH_PARALLELISM,
+            ),
+        )
+    )
 
     async def get_password_hash(self, password: str) -> str:
-        return await asyncio.to_thread(self.password_hash.hash, password)
+        return await password_hash_pool.run(self.password_hash.hash, password)
 
     async def verify_password(self, plain_password: str, hashed_password: str) -> bool:
-        return await asyncio.to_thread(
+        return await password_hash_pool.run(
             self.password_hash.verify,
             plain_password,
             hashed_password,
         )
+
+    async def verify_and_update_password(
+        self,
+        plain_password: str,
+        hashed_password: str,
+    ) -> tuple[bool, str | None]:
+        return await password_hash_pool.run(
+            self.password_hash.verify_and_update,
+            plain_password,
+            hashed_password,
+        )
@@ -0,0 +1,17 @@
+import os
+
+import fakeredis
+import redis.asyncio
+
+os.environ.update(
+    DB_USER="test",
+    DB_PASSWORD="test",
+    DB_HOST="localhost",
+    DB_PORT="5432",
+    DB_NAME="test",
+    SECRET_KEY="test-secret-key-with-at-least-32-characters",
+    REDIS_URL="redis://localhost:6379/0",
+)
+
+fake_redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+redis.asyncio.from_url = lambda *args, **kwargs: fake_redis
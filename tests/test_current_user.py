@@ -0,0 +1,100 @@
+import asyncio
+import time
+from dataclasses import replace
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+from redis.exceptions import RedisError
+
+from main.config import settings
+from main.services.auth import AuthRegUserServices, jwt_token, user_state_cache
+
+
+class StubRepository:
+    def __init__(self, active: bool = True) -> None:
+        self.active = active
+        self.checks = 0
+
+    async def is_active_user(self, user_id: UUID) -> bool:
+        self.checks += 1
+        return self.active
+
+
+async def issue_access_token(user_id: UUID) -> str:
+    tokens = await jwt_token.create_token_pair(str(user_id))
+    return tokens["access_token"]
+
+
+def test_inactive_user_is_rejected() -> None:
+    async def scenario() -> None:
+        user_id = uuid4()
+        token = await issue_access_token(user_id)
+        service = AuthRegUserServices(repository=StubRepository(active=False))
+        with pytest.raises(HTTPException) as error:
+            await service.get_current_user(token)
+        assert error.value.status_code == 401
+        assert error.value.detail == "Пользователь неактивен"
+
+    asyncio.run(scenario())
+
+
+def test_user_state_is_cached_between_requests() -> None:
+    async def scenario() -> None:
+        user_id = uuid4()
+        token = await issue_access_token(user_id)
+        repository = StubRepository()
+        service = AuthRegUserServices(repository=repository)
+        assert (await service.get_current_user(token)).user_id == user_id
+        assert (await service.get_current_user(token)).user_id == user_id
+        assert repository.checks == 1
+
+        user_state_cache.pop(user_id)
+        repository.active = False
+        with pytest.raises(HTTPException):
+            await service.get_current_user(token)
+
+    asyncio.run(scenario())
+
+
+def test_redis_outage_fails_closed_without_cached_version(monkeypatch) -> None:
+    async def unavailable(user_id: str) -> int:
+        raise RedisError("down")
+
+    async def scenario() -> None:
+        user_id = uuid4()
+        token = await issue_access_token(user_id)
+        monkeypatch.setattr(jwt_token, "token_version", unavailable)
+        service = AuthRegUserServices(repository=StubRepository())
+        with pytest.raises(RedisError):
+            await service.get_current_user(token)
+
+    asyncio.run(scenario())
+
+
+def test_redis_outage_uses_cached_version_within_grace(monkeypatch) -> None:
+    async def unavailable(user_id: str) -> int:
+        raise RedisError("down")
+
+    async def scenario() -> None:
+        user_id = uuid4()
+        token = await issue_access_token(user_id)
+        service = AuthRegUserServices(repository=StubRepository())
+        await service.get_current_user(token)
+        await jwt_token.revoke_user_tokens(str(user_id))
+        state = user_state_cache.get(user_id)
+        user_state_cache.set(
+            user_id,
+            replace(state, version=state.version + 1, checked_at=state.checked_at - 6),
+            time.time() + 60,
+        )
+        monkeypatch.setattr(jwt_token, "token_version", unavailable)
+        with pytest.raises(HTTPException) as error:
+            await service.get_current_user(token)
+        assert error.value.detail == "Токен отозван"
+
+        monkeypatch.setattr(settings, "AUTH_REDIS_GRACE_SECONDS", 1)
+        with pytest.raises(RedisError):
+            await service.get_current_user(token)
+
+    asyncio.run(scenario())
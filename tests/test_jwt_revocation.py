@@ -0,0 +1,40 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from main.redis import redis_client
+from main.services.jwt import JwtAuth
+
+jwt_token = JwtAuth()
+
+
+async def expire_keys_with_ttl() -> None:
+    async for key in redis_client.scan_iter():
+        if await redis_client.ttl(key) > 0:
+            await redis_client.delete(key)
+
+
+async def assert_revoked(user_id: str, tokens: dict[str, str]) -> None:
+    access = jwt_token.decode_token(tokens["access_token"], expected_type="access")
+    assert access["ver"] < await jwt_token.token_version(user_id)
+    refresh = jwt_token.decode_token(tokens["refresh_token"], expected_type="refresh")
+    with pytest.raises(HTTPException):
+        await jwt_token.rotate_refresh_token(refresh)
+
+
+def test_logout_all_survives_expiry_of_token_keys() -> None:
+    async def scenario() -> None:
+        user_id = str(uuid4())
+        await jwt_token.create_token_pair(user_id)
+        assert await jwt_token.revoke_user_tokens(user_id) == 1
+
+        issued_after_revoke = await jwt_token.create_token_pair(user_id)
+        await expire_keys_with_ttl()
+        assert await jwt_token.token_version(user_id) == 1
+
+        assert await jwt_token.revoke_user_tokens(user_id) == 2
+        await assert_revoked(user_id, issued_after_revoke)
+
+    asyncio.run(scenario())
@@ -0,0 +1,26 @@
+import asyncio
+
+import pytest
+
+from main.services.hashing import PasswordHashPool
+
+
+def fail(message: str) -> None:
+    raise ValueError(message)
+
+
+def test_failed_jobs_are_timed() -> None:
+    async def scenario() -> None:
+        pool = PasswordHashPool(workers=1, queue_size=1)
+        try:
+            assert await pool.run(str.upper, "ok") == "OK"
+            with pytest.raises(ValueError):
+                await pool.run(fail, "invalid hash")
+            await asyncio.sleep(0)
+            assert pool.pending == 0
+            assert pool.wait.count == 2
+            assert pool.duration.count == 2
+        finally:
+            pool.shutdown()
+
+    asyncio.run(scenario())
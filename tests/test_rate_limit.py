@@ -0,0 +1,63 @@
+import asyncio
+import time
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from main.redis import redis_breaker, redis_client
+from main.services.rate_limit import RateLimit, enforce_rate_limits
+
+
+def rate_limit(limit: int, window_seconds: int = 60) -> RateLimit:
+    return RateLimit("test", str(uuid4()), limit, window_seconds)
+
+
+async def admitted(*limits: RateLimit) -> bool:
+    try:
+        await enforce_rate_limits(*limits)
+    except HTTPException as error:
+        assert error.status_code == 429
+        return False
+    return True
+
+
+def test_burst_is_admitted_then_rejected_with_retry_after() -> None:
+    async def scenario() -> None:
+        limit = rate_limit(2)
+        assert await admitted(limit)
+        assert await admitted(limit)
+        with pytest.raises(HTTPException) as error:
+            await enforce_rate_limits(limit)
+        assert error.value.status_code == 429
+        assert error.value.headers == {"Retry-After": "30"}
+
+    asyncio.run(scenario())
+
+
+def test_tight_limit_does_not_consume_other_budgets() -> None:
+    async def scenario() -> None:
+        tight, loose = rate_limit(1), rate_limit(3)
+        assert await admitted(tight, loose)
+        for _ in range(5):
+            assert not await admitted(tight, loose)
+        assert await admitted(loose)
+        assert await admitted(loose)
+        assert not await admitted(loose)
+
+    asyncio.run(scenario())
+
+
+def test_local_buckets_limit_while_breaker_is_open(monkeypatch) -> None:
+    monkeypatch.setattr(redis_breaker, "opened_at", time.monotonic())
+
+    async def scenario() -> None:
+        limit = rate_limit(2)
+        assert await admitted(limit)
+        assert await admitted(limit)
+        with pytest.raises(HTTPException) as error:
+            await enforce_rate_limits(limit)
+        assert error.value.headers == {"Retry-After": "30"}
+        assert not await redis_client.exists(limit.key)
+
+    asyncio.run(scenario())
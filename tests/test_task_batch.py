@@ -0,0 +1,59 @@
+import asyncio
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from main.repositories.tasks import TeamAccess
+from main.schemas.tasks import TaskBatchCreate, TaskCreate
+from main.services.tasks import TaskServices
+
+CHIEF, MEMBER = uuid4(), uuid4()
+ACCESS = TeamAccess(team_id=uuid4(), members={CHIEF: True, MEMBER: False})
+
+
+class StubRepository:
+    def __init__(self) -> None:
+        self.inserted: list[TaskCreate] = []
+
+    async def get_team_access(self, team_id: UUID, user_ids: set[UUID]) -> TeamAccess:
+        return ACCESS
+
+    async def create_tasks(self, items, team_id, author_id, now) -> list[UUID]:
+        self.inserted = items
+        return [uuid4() for _ in items]
+
+
+def task(executor: UUID | None = None) -> TaskCreate:
+    return TaskCreate(
+        task_name="task",
+        task_text="text",
+        executor=executor,
+        priority="medium",
+        difficulty="unknown",
+    )
+
+
+def create(repository: StubRepository, items: list[TaskCreate], atomic: bool):
+    service = TaskServices(repository=repository)
+    data = TaskBatchCreate(items=items, atomic=atomic)
+    return asyncio.run(service.create_tasks(data, ACCESS.team_id, CHIEF))
+
+
+def test_partial_batch_creates_valid_items() -> None:
+    repository = StubRepository()
+    result = create(repository, [task(uuid4()), task(MEMBER)], atomic=False)
+    assert (result.created, result.failed) == (1, 1)
+    assert result.items[0].detail == "Исполнитель не состоит в команде"
+    assert result.items[1].task_id is not None
+    assert len(repository.inserted) == 1
+
+
+@pytest.mark.parametrize("atomic", [True, False])
+def test_batch_without_valid_items_is_rejected(atomic: bool) -> None:
+    repository = StubRepository()
+    with pytest.raises(HTTPException) as error:
+        create(repository, [task(uuid4()), task(uuid4())], atomic=atomic)
+    assert error.value.status_code == 400
+    assert [item["index"] for item in error.value.detail] == [0, 1]
+    assert repository.inserted == []
@@ -0,0 +1,150 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from main.db.models.tasks import Status
+from main.repositories.tasks import TeamAccess
+from main.schemas.tasks import TaskBulkAction, TaskBulkOperation
+from main.services.tasks import TaskServices
+
+CHIEF, AUTHOR, EXECUTOR, MEMBER, OUTSIDER = (uuid4() for _ in range(5))
+ACCESS = TeamAccess(
+    team_id=uuid4(),
+    members={CHIEF: True, AUTHOR: False, EXECUTOR: False, MEMBER: False},
+)
+EDIT_DENIED = "Редактировать задачу может автор или руководитель"
+COMPLETE_DENIED = "Завершить задачу может исполнитель или руководитель"
+
+
+def task_state(status: Status = Status.assigned, executor: UUID | None = EXECUTOR):
+    return SimpleNamespace(
+        task_id=uuid4(),
+        author=AUTHOR,
+        executor=executor,
+        status=status,
+    )
+
+
+def bulk_error(operation: TaskBulkOperation, state, actor_id: UUID) -> str | None:
+    return TaskServices._bulk_error(operation, state, ACCESS, actor_id)
+
+
+@pytest.mark.parametrize("operation", list(TaskBulkOperation))
+def test_missing_task_is_not_found(operation: TaskBulkOperation) -> None:
+    assert bulk_error(operation, None, CHIEF) == "Задача не найдена"
+
+
+@pytest.mark.parametrize(
+    ("actor_id", "expected"),
+    [
+        (EXECUTOR, None),
+        (CHIEF, None),
+        (AUTHOR, COMPLETE_DENIED),
+        (MEMBER, COMPLETE_DENIED),
+    ],
+)
+def test_complete_requires_executor_or_chief(
+    actor_id: UUID,
+    expected: str | None,
+) -> None:
+    assert bulk_error(TaskBulkOperation.complete, task_state(), actor_id) == expected
+
+
+def test_complete_rejects_unassigned_and_closed_tasks() -> None:
+    unassigned = task_state(Status.unassigned, executor=None)
+    assert (
+        bulk_error(TaskBulkOperation.complete, unassigned, CHIEF)
+        == "Нельзя завершить задачу без исполнителя"
+    )
+    for status in (Status.completed, Status.canceled):
+        assert (
+            bulk_error(TaskBulkOperation.complete, task_state(status), EXECUTOR)
+            == "Задача уже закрыта"
+        )
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [TaskBulkOperation.cancel, TaskBulkOperation.reassign, TaskBulkOperation.delete],
+)
+@pytest.mark.parametrize(
+    ("actor_id", "expected"),
+    [
+        (AUTHOR, None),
+        (CHIEF, None),
+        (EXECUTOR, EDIT_DENIED),
+        (MEMBER, EDIT_DENIED),
+    ],
+)
+def test_edits_require_author_or_chief(
+    operation: TaskBulkOperation,
+    actor_id: UUID,
+    expected: str | None,
+) -> None:
+    assert bulk_error(operation, task_state(), actor_id) == expected
+
+
+def test_closed_tasks_can_only_be_deleted() -> None:
+    closed = task_state(Status.completed)
+    assert bulk_error(TaskBulkOperation.delete, closed, AUTHOR) is None
+    for operation in (TaskBulkOperation.cancel, TaskBulkOperation.reassign):
+        assert (
+            bulk_error(operation, closed, AUTHOR)
+            == "Завершённую или отменённую задачу нельзя редактировать"
+        )
+
+
+class StubRepository:
+    def __init__(self, states: dict[UUID, SimpleNamespace]) -> None:
+        self.states = states
+        self.completed: list[UUID] = []
+
+    async def get_team_access(self, team_id: UUID, user_ids: set[UUID]) -> TeamAccess:
+        return ACCESS
+
+    async def get_task_states(self, team_id: UUID, task_ids: list[UUID]) -> dict:
+        return {
+            task_id: self.states[task_id]
+            for task_id in task_ids
+            if task_id in self.states
+        }
+
+    async def complete_tasks(self, task_ids: list[UUID], actor_id, now) -> list[UUID]:
+        self.completed = task_ids
+        return task_ids[1:]
+
+
+def test_outsider_cannot_apply_bulk_action() -> None:
+    service = TaskServices(repository=StubRepository({}))
+    action = TaskBulkAction(task_ids=[uuid4()], operation=TaskBulkOperation.complete)
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(service.apply_bulk_action(action, ACCESS.team_id, OUTSIDER))
+    assert error.value.status_code == 403
+
+
+def test_bulk_complete_reports_each_task() -> None:
+    raced, done = task_state(), task_state()
+    foreign = task_state(executor=MEMBER)
+    missing = uuid4()
+    repository = StubRepository(
+        {state.task_id: state for state in (raced, done, foreign)}
+    )
+    service = TaskServices(repository=repository)
+    action = TaskBulkAction(
+        task_ids=[raced.task_id, done.task_id, foreign.task_id, missing, done.task_id],
+        operation=TaskBulkOperation.complete,
+    )
+
+    result = asyncio.run(service.apply_bulk_action(action, ACCESS.team_id, EXECUTOR))
+
+    assert repository.completed == [raced.task_id, done.task_id]
+    assert (result.applied, result.failed) == (1, 3)
+    assert [(item.applied, item.detail) for item in result.items] == [
+        (False, "Состояние задачи изменилось"),
+        (True, None),
+        (False, COMPLETE_DENIED),
+        (False, "Задача не найдена"),
+    ]
@@ -0,0 +1,78 @@
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from main.api.tasks import etag_matches, parse_if_match, prefers, task_etag
+from main.services.tasks import TaskServices
+
+STALE = "Задача была изменена, обновите данные"
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, None),
+        ("*", None),
+        (" * ", None),
+        ('"3"', frozenset({3})),
+        ('"3", "5" ,"8"', frozenset({3, 5, 8})),
+        ('W/"3"', frozenset()),
+        ('W/"3", "4"', frozenset({4})),
+        ('"abc", 3, "", "-1"', frozenset()),
+    ],
+)
+def test_parse_if_match(header: str | None, expected: frozenset[int] | None) -> None:
+    assert parse_if_match(header) == expected
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, False),
+        ("*", True),
+        ('"7"', True),
+        ('W/"7"', True),
+        ('"6", W/"7"', True),
+        ('"6", "8"', False),
+        ('"07"', False),
+        ("7", False),
+    ],
+)
+def test_etag_matches_uses_weak_comparison(header: str | None, expected: bool) -> None:
+    assert etag_matches(header, 7) is expected
+
+
+def test_task_etag_is_strong() -> None:
+    assert task_etag(12) == '"12"'
+    assert parse_if_match(task_etag(12)) == frozenset({12})
+
+
+def test_prefers() -> None:
+    assert prefers("return=minimal", "return=minimal")
+    assert prefers("respond-async, Return=Minimal; q=1", "return=minimal")
+    assert not prefers("return=representation", "return=minimal")
+    assert not prefers(None, "return=minimal")
+
+
+def test_require_version() -> None:
+    task = SimpleNamespace(version=4)
+    TaskServices._require_version(task, None)
+    TaskServices._require_version(task, frozenset({3, 4}))
+    for versions in (frozenset({3}), frozenset()):
+        with pytest.raises(HTTPException) as error:
+            TaskServices._require_version(task, versions)
+        assert (error.value.status_code, error.value.detail) == (412, STALE)
+
+
+@pytest.mark.parametrize(
+    ("versions", "status_code"),
+    [(None, 409), (frozenset({4}), 412), (frozenset(), 412)],
+)
+def test_raise_conflict_splits_412_and_409(
+    versions: frozenset[int] | None,
+    status_code: int,
+) -> None:
+    with pytest.raises(HTTPException) as error:
+        TaskServices._raise_conflict(versions)
+    assert error.value.status_code == status_code
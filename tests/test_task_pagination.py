@@ -0,0 +1,85 @@
+import base64
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from main.db.models.tasks import Difficulty, Priority, Status, Task
+from main.services.tasks import TaskServices
+
+
+def make_task(created_at: datetime) -> Task:
+    return Task(
+        task_id=uuid4(),
+        team_id=uuid4(),
+        task_name="task",
+        task_text="text",
+        author=uuid4(),
+        status=Status.unassigned,
+        priority=Priority.medium,
+        difficulty=Difficulty.unknown,
+        task_create_date=created_at,
+        version=1,
+    )
+
+
+def encode(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def test_cursor_round_trip() -> None:
+    sort_key = (datetime(2026, 1, 2, 3, 4, 5, 678, tzinfo=UTC), uuid4())
+    cursor = TaskServices._encode_cursor(sort_key)
+    assert "=" not in cursor
+    assert TaskServices._decode_cursor(cursor, 0) == sort_key
+    assert TaskServices._decode_cursor(None, 10) is None
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        "Zm9v",
+        encode(f"2026-01-02T03:04:05|{uuid4()}"),
+        encode("2026-01-02T03:04:05+00:00|not-a-uuid"),
+        encode(f"yesterday|{uuid4()}"),
+        encode(f"2026-01-02T03:04:05+00:00|{uuid4()}|extra"),
+        base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+    ],
+)
+def test_malformed_cursor_is_rejected(cursor: str) -> None:
+    with pytest.raises(HTTPException) as error:
+        TaskServices._decode_cursor(cursor, 0)
+    assert error.value.status_code == 400
+    assert error.value.detail == "Некорректный курсор"
+
+
+def test_cursor_with_offset_is_rejected() -> None:
+    cursor = TaskServices._encode_cursor((datetime.now(UTC), uuid4()))
+    with pytest.raises(HTTPException) as error:
+        TaskServices._decode_cursor(cursor, 50)
+    assert error.value.status_code == 400
+    assert error.value.detail == "Параметры cursor и offset нельзя использовать вместе"
+
+
+def test_next_cursor_only_when_another_page_exists() -> None:
+    now = datetime.now(UTC)
+    tasks = [make_task(now - timedelta(minutes=index)) for index in range(3)]
+
+    last_page = TaskServices._task_page(tasks[:2], None, None, 2, 0)
+    assert last_page.next_cursor is None
+    assert len(last_page.items) == 2
+
+    page = TaskServices._task_page(tasks, 10, None, 2, 0)
+    assert [item.task_id for item in page.items] == [t.task_id for t in tasks[:2]]
+    assert TaskServices._decode_cursor(page.next_cursor, 0) == (
+        tasks[1].task_create_date,
+        tasks[1].task_id,
+    )
+
+
+def test_total_is_capped() -> None:
+    page = TaskServices._task_page([], 5000, 1000, 50, 0)
+    assert page.total == 1000
+    assert page.total_capped
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+from uuid import UUID, uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from main.repositories.tasks import TeamAccess
+from main.schemas.tasks import TaskSeriesBucket
+from main.services.tasks import TaskServices
+
+CHIEF, MEMBER, OUTSIDER = uuid4(), uuid4(), uuid4()
+ACCESS = TeamAccess(team_id=uuid4(), members={CHIEF: True, MEMBER: False})
+
+
+class StubRepository:
+    def __init__(self) -> None:
+        self.period: tuple[date, date] | None = None
+
+    async def get_team_access(self, team_id: UUID, user_ids: set[UUID]) -> TeamAccess:
+        return ACCESS
+
+    async def get_completion_series(self, team_id, user_id, bucket, start_day, end_day):
+        self.period = start_day, end_day
+        return {start_day: 3}
+
+
+def series(repository: StubRepository, bucket: TaskSeriesBucket, **kwargs):
+    service = TaskServices(repository=repository)
+    arguments = {"inspector_id": CHIEF, "user_id": None, "days": 40} | kwargs
+    return asyncio.run(
+        service.get_completion_series(ACCESS.team_id, bucket=bucket, **arguments)
+    )
+
+
+@pytest.mark.parametrize(
+    ("bucket", "aligned"),
+    [
+        (TaskSeriesBucket.day, lambda day: True),
+        (TaskSeriesBucket.week, lambda day: day.weekday() == 0),
+        (TaskSeriesBucket.month, lambda day: day.day == 1),
+    ],
+)
+def test_first_bucket_is_complete(bucket: TaskSeriesBucket, aligned) -> None:
+    repository = StubRepository()
+    result = series(repository, bucket)
+    today = datetime.now(UTC).date()
+    start_day, end_day = repository.period
+    assert aligned(start_day)
+    assert start_day <= today - timedelta(days=39)
+    assert (result.start_date, result.end_date) == (start_day, end_day)
+    assert result.items[0].bucket_start == start_day
+    assert result.items[0].completed == 3
+
+
+def test_series_of_non_member_is_rejected() -> None:
+    with pytest.raises(HTTPException) as error:
+        series(StubRepository(), TaskSeriesBucket.day, user_id=OUTSIDER)
+    assert error.value.status_code == 403
+
+
+def test_member_cannot_read_foreign_series() -> None:
+    series(StubRepository(), TaskSeriesBucket.day, inspector_id=MEMBER, user_id=MEMBER)
+    with pytest.raises(HTTPException) as error:
+        series(
+            StubRepository(), TaskSeriesBucket.day, inspector_id=MEMBER, user_id=CHIEF
+        )
+    assert error.value.status_code == 403